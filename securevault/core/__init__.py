@@ -3,7 +3,7 @@ Core functionality for SecureVault password manager
 """
 
 from .encryption import EncryptionManager
-from .password_manager import PasswordManager, PasswordEntry
+from .password_manager import PasswordManager, PasswordEntry, DecryptingView
 
 __all__ = [
     # Encryption class
@@ -11,5 +11,6 @@ __all__ = [
     
     # Password manager classes
     'PasswordManager',
-    'PasswordEntry'
+    'PasswordEntry',
+    'DecryptingView'
 ] 
\ No newline at end of file
@@ -10,19 +10,56 @@ After researching, I learned about:
 
 import os
 import base64
+import hashlib
+import hmac
 import json
+import struct
 from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
+
+# Upper bound on how many decrypted passwords we keep around
+DECRYPT_CACHE_SIZE = 4096
+
+# Master password file format
+# Version 1 used PBKDF2-HMAC-SHA256, version 2 uses PBKDF2-HMAC-SHA512
+# (SHA-512 works on 64-bit words, so it is faster on 64-bit CPUs)
+MASTER_FILE_VERSION = 2
+KDF_HASHES = {1: 'sha256', 2: 'sha512'}
+
+# PBKDF2 iterations for new master passwords. The count used is stored in
+# the master password file
+KDF_ITERATIONS = 100000
+
+# Files written before the count was stored always used 100,000
+LEGACY_KDF_ITERATIONS = 100000
 
 
 class EncryptionManager:
     """Manages encryption operations for the password manager"""
     
-    def __init__(self):
+    def __init__(self, storage_dir=None):
+        """
+        Args:
+            storage_dir (str): Folder for the master password file
+                (the current directory if not given)
+        """
         self.fernet = None
-        self.master_password_file = "master_password.json"
+        self.master_password_file = os.path.join(storage_dir or "", "master_password.json")
         self.salt = None
+        # Parsed master password file, read once and reused
+        self._master_data = None
+        # Key that last passed verification, and a hash of the inputs it
+        # was derived from, so re-verifying the same password in one
+        # session doesn't repeat the whole PBKDF2 run. Keys from wrong
+        # passwords are never kept
+        self._last_good_key = None
+        self._last_good_id = None
+        # Ciphertext -> plaintext, so redrawing the list doesn't decrypt again
+        self._decrypt_cache = {}
+        # Raw Fernet key halves, used by the bulk decrypt path
+        self._signing_key = None
+        self._encryption_key = None
         
     def generate_salt(self):
         """Generate a random salt for password hashing"""
@@ -30,13 +67,17 @@ class EncryptionManager:
         # I learned that 16 bytes is recommended for security
         return os.urandom(16)
     
-    def derive_key_from_password(self, password, salt):
+    def derive_key_from_password(self, password, salt, hash_name='sha512',
+                                 iterations=KDF_ITERATIONS):
         """
         Derive an encryption key from the master password using PBKDF2
         
         Args:
             password (str): The master password
             salt (bytes): Random salt for key derivation
+            hash_name (str): Hash used inside PBKDF2 ('sha512', or 'sha256'
+                for version 1 files)
+            iterations (int): PBKDF2 iteration count
             
         Returns:
             bytes: The derived encryption key
@@ -44,27 +85,80 @@ class EncryptionManager:
         # Convert password to bytes
         password_bytes = password.encode('utf-8')
         
-        # Create PBKDF2 instance
-        # Using 100,000 iterations as recommended for security
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,  # 32 bytes = 256 bits
-            salt=salt,
-            iterations=100000,  # High iteration count for security
-        )
+        # Reuse the key if it is the one that last verified
+        if self._last_good_id is not None and hmac.compare_digest(
+                self._derivation_id(password_bytes, salt, hash_name, iterations),
+                self._last_good_id):
+            return self._last_good_key
         
-        # Derive the key
-        key = kdf.derive(password_bytes)
+        # Derive the key with PBKDF2-HMAC
+        # hashlib calls straight into OpenSSL's C implementation
+        # Using 100,000 iterations (KDF_ITERATIONS) as recommended for security
+        key = hashlib.pbkdf2_hmac(
+            hash_name,
+            password_bytes,
+            salt,
+            iterations,  # High iteration count for security
+            dklen=32  # 32 bytes = 256 bits
+        )
         
         # Fernet needs the key to be base64 encoded
         return base64.urlsafe_b64encode(key)
     
-    def set_master_password(self, password):
+    def _derivation_id(self, password_bytes, salt, hash_name, iterations):
+        """Hash of everything a derived key depends on (identifies the key)"""
+        return hashlib.sha256(hash_name.encode('ascii') + struct.pack('>I', iterations)
+                              + salt + password_bytes).digest()
+    
+    def _remember_good_key(self, key, password, salt, hash_name, iterations):
+        """Keep a key that verified, so deriving it again is skipped"""
+        self._last_good_key = key
+        self._last_good_id = self._derivation_id(password.encode('utf-8'), salt,
+                                                 hash_name, iterations)
+    
+    def key_fingerprint(self, key):
+        """
+        Compute a short fingerprint of a derived key
+        
+        The fingerprint is stored next to the salt so a password can be
+        checked with one HMAC instead of a full Fernet decrypt
+        
+        Args:
+            key (bytes): The derived (base64 encoded) key
+            
+        Returns:
+            str: Hex encoded HMAC-SHA256 of the key
+        """
+        return hmac.new(b"sv-fp", key, 'sha256').hexdigest()
+    
+    def clear_cache(self):
+        """Forget any cached keys (called when the vault is locked)"""
+        self._last_good_key = None
+        self._last_good_id = None
+        self._decrypt_cache.clear()
+        self._signing_key = None
+        self._encryption_key = None
+    
+    def _use_key(self, key):
+        """Make a derived key the active encryption key"""
+        self.fernet = Fernet(key)
+        # A Fernet key is a 128-bit HMAC key followed by a 128-bit AES key
+        raw_key = base64.urlsafe_b64decode(key)
+        self._signing_key = raw_key[:16]
+        self._encryption_key = raw_key[16:]
+        self._decrypt_cache.clear()
+    
+    def forget_password(self, encrypted_password):
+        """Drop one ciphertext from the decrypt cache (e.g. after it is replaced)"""
+        self._decrypt_cache.pop(encrypted_password, None)
+    
+    def set_master_password(self, password, cost=None):
         """
         Set or update the master password
         
         Args:
             password (str): The new master password
+            cost (int): PBKDF2 iterations to use (defaults to KDF_ITERATIONS)
             
         Returns:
             bool: True if successful, False otherwise
@@ -73,11 +167,15 @@ class EncryptionManager:
             # Generate new salt
             self.salt = self.generate_salt()
             
-            # Derive key from password
-            key = self.derive_key_from_password(password, self.salt)
+            if cost is None:
+                cost = KDF_ITERATIONS
+            
+            # Derive key from password (new files always use the latest format)
+            hash_name = KDF_HASHES[MASTER_FILE_VERSION]
+            key = self.derive_key_from_password(password, self.salt, hash_name, cost)
             
             # Create Fernet instance with the key
-            self.fernet = Fernet(key)
+            self._use_key(key)
             
             # Store salt and a verification token
             # The verification token helps us check if the password is correct
@@ -85,13 +183,18 @@ class EncryptionManager:
             
             # Save to file
             data = {
+                "version": MASTER_FILE_VERSION,
                 "salt": base64.b64encode(self.salt).decode('utf-8'),
-                "verification": verification_token.decode('utf-8')
+                "iterations": cost,
+                "verification": verification_token.decode('ascii'),
+                "fingerprint": self.key_fingerprint(key)
             }
             
             with open(self.master_password_file, 'w') as f:
                 json.dump(data, f, indent=4)
+            self._master_data = data
             
+            self._remember_good_key(key, password, self.salt, hash_name, cost)
             return True
             
         except Exception as e:
@@ -109,37 +212,69 @@ class EncryptionManager:
             bool: True if password is correct, False otherwise
         """
         try:
-            # Check if master password file exists
-            if not os.path.exists(self.master_password_file):
+            # Load stored data (False if there is no master password file)
+            data = self._load_master_data()
+            if data is None:
                 return False
             
-            # Load stored data
-            with open(self.master_password_file, 'r') as f:
-                data = json.load(f)
-            
             # Decode salt
             self.salt = base64.b64decode(data['salt'])
             
             # Derive key from provided password
-            key = self.derive_key_from_password(password, self.salt)
+            # Files written before versioning was added are version 1
+            hash_name = KDF_HASHES[data.get('version', 1)]
+            iterations = data.get('iterations', LEGACY_KDF_ITERATIONS)
+            key = self.derive_key_from_password(password, self.salt, hash_name, iterations)
             
-            # Create Fernet instance
-            self.fernet = Fernet(key)
+            # Same key as the last successful check - nothing else to do
+            if self._last_good_key is not None and hmac.compare_digest(key, self._last_good_key):
+                if self.fernet is None:
+                    self._use_key(key)
+                return True
             
-            # Try to decrypt verification token
-            try:
-                decrypted = self.fernet.decrypt(data['verification'].encode())
-                return decrypted == b"PASSWORD_CORRECT"
-            except:
-                # If decryption fails, password is wrong
-                return False
+            if "fingerprint" in data:
+                # Newer files store a fingerprint of the key, so we can
+                # check it without decrypting the verification token
+                if not hmac.compare_digest(self.key_fingerprint(key), data['fingerprint']):
+                    return False
+            else:
+                # Older files only have the verification token
+                try:
+                    decrypted = Fernet(key).decrypt(data['verification'].encode())
+                except:
+                    # If decryption fails, password is wrong
+                    return False
+                # Constant-time comparison, like the fingerprint check
+                if not hmac.compare_digest(decrypted, b"PASSWORD_CORRECT"):
+                    return False
+            
+            # Password is correct - create Fernet instance
+            self._use_key(key)
+            self._remember_good_key(key, password, self.salt, hash_name, iterations)
+            return True
                 
         except Exception as e:
             print(f"Error verifying password: {e}")
             return False
     
+    def _load_master_data(self):
+        """
+        Read the master password file, caching the parsed result
+        
+        Returns:
+            dict: The stored data, or None if the file doesn't exist
+        """
+        if self._master_data is None:
+            if not os.path.exists(self.master_password_file):
+                return None
+            with open(self.master_password_file, 'r') as f:
+                self._master_data = json.load(f)
+        return self._master_data
+    
     def is_master_password_set(self):
         """Check if a master password has been set"""
+        if self._master_data is not None:
+            return True
         return os.path.exists(self.master_password_file)
     
     def encrypt_password(self, password):
@@ -160,7 +295,7 @@ class EncryptionManager:
         encrypted = self.fernet.encrypt(password_bytes)
         
         # Return as string for JSON storage
-        return encrypted.decode('utf-8')
+        return encrypted.decode('ascii')
     
     def decrypt_password(self, encrypted_password):
         """
@@ -175,18 +310,133 @@ class EncryptionManager:
         if not self.fernet:
             raise Exception("No decryption key available. Please unlock with master password.")
         
+        # Already decrypted this ciphertext?
+        cached = self._decrypt_cache.get(encrypted_password)
+        if cached is not None:
+            return cached
+        
         try:
             # Convert back to bytes and decrypt
-            encrypted_bytes = encrypted_password.encode('utf-8')
-            decrypted = self.fernet.decrypt(encrypted_bytes)
-            
-            # Return as string
-            return decrypted.decode('utf-8')
-            
+            encrypted_bytes = encrypted_password.encode('ascii')
+            decrypted = self.fernet.decrypt(encrypted_bytes).decode('utf-8')
         except Exception as e:
             print(f"Error decrypting password: {e}")
             # Return error message instead of crashing
             return "[Decryption Error]"
+        
+        self._remember(encrypted_password, decrypted)
+        
+        # Return as string
+        return decrypted
+    
+    def decrypt_passwords(self, encrypted_passwords):
+        """
+        Decrypt many stored passwords in one go
+        
+        Fernet tokens are parsed here directly (version, timestamp, IV,
+        ciphertext, HMAC) instead of going through the Fernet wrapper for
+        each one - see _decrypt_tokens
+        
+        Args:
+            encrypted_passwords (list): Encrypted passwords as base64 strings
+            
+        Returns:
+            list: The decrypted passwords, in the same order
+        """
+        if not self.fernet:
+            raise Exception("No decryption key available. Please unlock with master password.")
+        
+        cache = self._decrypt_cache
+        decrypted_passwords = [cache.get(p) for p in encrypted_passwords]
+        
+        # Only the ones we haven't seen before need decrypting
+        missing = [i for i, d in enumerate(decrypted_passwords) if d is None]
+        if missing:
+            tokens = [encrypted_passwords[i] for i in missing]
+            for i, token, decrypted in zip(missing, tokens, self._decrypt_tokens(tokens)):
+                if decrypted is None:
+                    print("Error decrypting password: invalid token")
+                    decrypted = "[Decryption Error]"
+                else:
+                    self._remember(token, decrypted)
+                decrypted_passwords[i] = decrypted
+        
+        return decrypted_passwords
+    
+    def _decrypt_tokens(self, tokens):
+        """
+        Verify and decrypt a batch of Fernet tokens (no TTL check, like decrypt())
+        
+        All HMACs are checked first, then the ciphertext blocks of every
+        valid token go through AES in a single call, so the per-token
+        Python work is small
+        
+        Args:
+            tokens (list): Fernet tokens as base64 strings
+            
+        Returns:
+            list: Decrypted strings, or None for tokens that failed
+        """
+        results = [None] * len(tokens)
+        
+        # HMAC keyed once, then copied for each token
+        base_mac = hmac.new(self._signing_key, digestmod='sha256')
+        valid = []  # (position, IV + ciphertext)
+        
+        for position, token in enumerate(tokens):
+            try:
+                data = base64.urlsafe_b64decode(token)
+            except ValueError:
+                continue
+            
+            # 1 version byte + 8 timestamp + 16 IV + at least one AES block + 32 HMAC
+            if len(data) < 73 or data[0] != 0x80 or (len(data) - 57) % 16:
+                continue
+            
+            # Check the HMAC before touching the ciphertext
+            mac = base_mac.copy()
+            mac.update(data[:-32])
+            if not hmac.compare_digest(mac.digest(), data[-32:]):
+                continue
+            
+            valid.append((position, data[9:-32]))
+        
+        if not valid:
+            return results
+        
+        # CBC decryption is P[i] = AES_decrypt(C[i]) XOR C[i-1] (with C[0] = IV),
+        # so the AES part of every block of every token is done in one call
+        # and only the XOR is left for each token
+        decryptor = Cipher(algorithms.AES(self._encryption_key), modes.ECB()).decryptor()
+        blocks = decryptor.update(b"".join([chunk[16:] for _, chunk in valid]))
+        blocks += decryptor.finalize()
+        
+        offset = 0
+        for position, chunk in valid:
+            size = len(chunk) - 16
+            decrypted = blocks[offset:offset + size]
+            offset += size
+            
+            padded = (int.from_bytes(decrypted, 'big') ^
+                      int.from_bytes(chunk[:-16], 'big')).to_bytes(size, 'big')
+            
+            # PKCS7 padding (the HMAC already proved the token is genuine)
+            pad = padded[-1]
+            if not 1 <= pad <= 16 or padded[-pad:] != bytes([pad]) * pad:
+                continue
+            try:
+                results[position] = padded[:-pad].decode('utf-8')
+            except UnicodeDecodeError:
+                continue
+        
+        return results
+    
+    def _remember(self, encrypted_password, decrypted):
+        """Add to the decrypt cache, dropping the oldest item when it is full"""
+        # Dicts keep insertion order, so the first key is the oldest
+        if len(self._decrypt_cache) >= DECRYPT_CACHE_SIZE:
+            del self._decrypt_cache[next(iter(self._decrypt_cache))]
+        self._decrypt_cache[encrypted_password] = decrypted
 
 
 # Test the encryption manager (for development only)
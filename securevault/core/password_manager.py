@@ -3,35 +3,153 @@ password_manager.py - Core business logic for the password manager
 Handles password storage, retrieval, generation, and management
 """
 
+import bisect
+import functools
 import json
 import os
-import random
+import secrets
 import string
 from datetime import datetime
 from .encryption import EncryptionManager
 
+# orjson is optional - it is much faster than the json module on big vaults
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _dump_json(data):
+    """Serialize data to compact JSON bytes"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+
+def _load_json(raw):
+    """Parse JSON bytes (orjson errors are json.JSONDecodeError subclasses)"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+@functools.lru_cache(maxsize=16)
+def _charset(use_uppercase, use_lowercase, use_digits, use_symbols):
+    """Build (and remember) the character set for one combination of options"""
+    chars = ""
+    
+    if use_lowercase:
+        chars += string.ascii_lowercase
+    if use_uppercase:
+        chars += string.ascii_uppercase
+    if use_digits:
+        chars += string.digits
+    if use_symbols:
+        # Using a limited set of symbols to avoid issues
+        chars += "!@#$%^&*"
+    
+    # Make sure we have at least some characters to choose from
+    if not chars:
+        # Default to alphanumeric if nothing selected
+        chars = string.ascii_letters + string.digits
+    
+    return chars
+
+
+def _random_string(chars, length):
+    """
+    Pick length characters uniformly from chars (at most 256 of them)
+    
+    Randomness is read from the OS in one batch instead of one call per
+    character
+    """
+    size = len(chars)
+    
+    # Power of two alphabet (e.g. symbols only, 8 characters): the low
+    # bits of every byte pick a character with no bias
+    if size & (size - 1) == 0:
+        mask = size - 1
+        return ''.join([chars[b & mask] for b in secrets.token_bytes(length)])
+    
+    # Otherwise bytes >= limit are thrown away (rejection sampling) so
+    # b % size doesn't favour the first characters
+    limit = 256 - (256 % size)
+    result = []
+    while len(result) < length:
+        # Read twice what is needed so one read is almost always enough
+        raw = secrets.token_bytes(2 * (length - len(result)))
+        result.extend([chars[b % size] for b in raw if b < limit])
+    return ''.join(result[:length])
+
 
 class PasswordEntry:
     """Represents a single password entry"""
     
-    def __init__(self, website, username, password, notes="", created_date=None):
+    # Fixed set of fields, so no per-entry __dict__ is needed
+    __slots__ = ("website", "username", "password", "notes",
+                 "created_date", "modified_date", "_haystack_lc", "_dict_cache")
+    
+    def __init__(self, website, username, password, notes="", created_date=None,
+                 modified_date=None):
         self.website = website
         self.username = username
         self.password = password  # This will be encrypted when stored
         self.notes = notes
-        self.created_date = created_date or datetime.now().isoformat()
-        self.modified_date = datetime.now().isoformat()
+        # Entries saved without dates (older files, or callers that don't
+        # pass them) get the current time, like before. Stored dates are
+        # used as they are, so loading a vault doesn't call now() per entry
+        if not (created_date and modified_date):
+            now = datetime.now().isoformat()
+            created_date = created_date or now
+            modified_date = modified_date or now
+        self.created_date = created_date
+        self.modified_date = modified_date
+        self._dict_cache = None
+        self.refresh_search_key()
+    
+    def refresh_search_key(self):
+        """
+        Precompute the lowercase text that searches run against
+        
+        Must be called again whenever website, username or notes change
+        """
+        # One string means one substring test per entry when searching
+        self._haystack_lc = "\x00".join(
+            (self.website.lower(), self.username.lower(), self.notes.lower())
+        )
+    
+    def matches(self, search_lower):
+        """Check if an already lowercased search term appears in this entry"""
+        return search_lower in self._haystack_lc
+    
+    @classmethod
+    def new(cls, website, username, password, notes=""):
+        """Create a brand new entry stamped with the current time"""
+        now = datetime.now().isoformat()
+        return cls(website, username, password, notes,
+                   created_date=now, modified_date=now)
     
     def to_dict(self):
-        """Convert the entry to a dictionary for JSON storage"""
-        return {
-            "website": self.website,
-            "username": self.username,
-            "password": self.password,
-            "notes": self.notes,
-            "created_date": self.created_date,
-            "modified_date": self.modified_date
-        }
+        """
+        Convert the entry to a dictionary for JSON storage
+        
+        The dictionary is cached, so saving unchanged entries doesn't build
+        them again. Don't modify it, and set _dict_cache to None after
+        changing the entry (update_entry does).
+        """
+        data = self._dict_cache
+        if data is None:
+            data = {
+                "website": self.website,
+                "username": self.username,
+                "password": self.password,
+                "notes": self.notes,
+                "created_date": self.created_date,
+                "modified_date": self.modified_date
+            }
+            self._dict_cache = data
+        return data
     
     @classmethod
     def from_dict(cls, data):
@@ -41,19 +159,104 @@ class PasswordEntry:
             username=data.get("username", ""),
             password=data.get("password", ""),
             notes=data.get("notes", ""),
-            created_date=data.get("created_date")
+            created_date=data.get("created_date"),
+            modified_date=data.get("modified_date")
         )
 
 
+class DecryptingView:
+    """
+    Read-only view of a stored entry that decrypts the password lazily
+    
+    The list only shows website/username/notes, so there is no point
+    decrypting every password up front - it happens on first access
+    """
+    
+    __slots__ = ("_entry", "_encryption_manager", "_password")
+    
+    def __init__(self, entry, encryption_manager, password=None):
+        self._entry = entry
+        self._encryption_manager = encryption_manager
+        # Already decrypted password, if the caller has one
+        self._password = password
+    
+    @property
+    def password(self):
+        """The decrypted password (decrypted once, then remembered)"""
+        if self._password is None:
+            self._password = self._encryption_manager.decrypt_password(self._entry.password)
+        return self._password
+    
+    @property
+    def website(self):
+        return self._entry.website
+    
+    @property
+    def username(self):
+        return self._entry.username
+    
+    @property
+    def notes(self):
+        return self._entry.notes
+    
+    @property
+    def created_date(self):
+        return self._entry.created_date
+    
+    @property
+    def modified_date(self):
+        return self._entry.modified_date
+    
+    def matches(self, search_lower):
+        """Check if an already lowercased search term appears in the entry"""
+        return self._entry.matches(search_lower)
+
+
 class PasswordManager:
     """Main class for managing passwords"""
     
-    def __init__(self):
-        self.encryption_manager = EncryptionManager()
-        self.passwords_file = "passwords.json"
-        self.entries = []
+    def __init__(self, storage_dir=None):
+        """
+        Args:
+            storage_dir (str): Folder holding the master password and
+                passwords files (the current directory if not given)
+        """
+        self.encryption_manager = EncryptionManager(storage_dir)
+        self.passwords_file = os.path.join(storage_dir or "", "passwords.json")
+        # None means "not read from disk yet" - see the entries property
+        self._entries = []
+        # (website.lower(), username) -> position in self.entries
+        self._index = {}
+        # website.lower() -> positions in self.entries, in order
+        self._website_index = {}
+        # Search text of each entry, kept parallel to self.entries so a
+        # search scans one flat list of strings
+        self._haystacks = []
         self.is_unlocked = False
+        # When autosave is off, changes are only written by flush()
+        self.autosave = True
+        self._dirty = False
         
+    @property
+    def entries(self):
+        """The stored entries, read from disk the first time they are needed"""
+        if self._entries is None:
+            self.load_entries()
+        return self._entries
+    
+    @entries.setter
+    def entries(self, value):
+        self._entries = value
+    
+    def _rebuild_index(self):
+        """Rebuild the lookup indexes and search column from self.entries"""
+        self._index = {(entry.website.lower(), entry.username): i
+                       for i, entry in enumerate(self.entries)}
+        self._website_index = {}
+        for i, entry in enumerate(self.entries):
+            self._website_index.setdefault(entry.website.lower(), []).append(i)
+        self._haystacks = [entry._haystack_lc for entry in self.entries]
+    
     def is_master_password_set(self):
         """Check if master password has been set"""
         return self.encryption_manager.is_master_password_set()
@@ -76,15 +279,26 @@ class PasswordManager:
         """Unlock the password manager with master password"""
         if self.encryption_manager.verify_master_password(password):
             self.is_unlocked = True
-            self.load_entries()
+            # Entries are loaded on first use, so unlocking stays quick
+            self.entries = None
             return True
         return False
     
     def lock(self):
         """Lock the password manager"""
-        self.is_unlocked = False
-        self.entries = []
-        self.encryption_manager.fernet = None
+        try:
+            # Don't lose changes that haven't been written yet
+            if self.is_unlocked:
+                self.flush()
+        finally:
+            # Lock even if that save fails - the error still reaches the caller
+            self.is_unlocked = False
+            self.entries = []
+            self._index = {}
+            self._website_index = {}
+            self._haystacks = []
+            self.encryption_manager.fernet = None
+            self.encryption_manager.clear_cache()
     
     def generate_password(self, length=16, use_uppercase=True, use_lowercase=True, 
                          use_digits=True, use_symbols=True):
@@ -101,50 +315,61 @@ class PasswordManager:
         Returns:
             str: Generated password
         """
-        # Build character set based on options
-        chars = ""
-        
-        if use_lowercase:
-            chars += string.ascii_lowercase
-        if use_uppercase:
-            chars += string.ascii_uppercase
-        if use_digits:
-            chars += string.digits
-        if use_symbols:
-            # Using a limited set of symbols to avoid issues
-            chars += "!@#$%^&*"
-        
-        # Make sure we have at least some characters to choose from
-        if not chars:
-            # Default to alphanumeric if nothing selected
-            chars = string.ascii_letters + string.digits
+        # Character set is cached per combination of options
+        chars = _charset(bool(use_uppercase), bool(use_lowercase),
+                         bool(use_digits), bool(use_symbols))
         
         # Generate password
-        # Initially I used random.choice but learned about more secure methods
-        # For now, keeping it simple for this supercurricular project
-        password = ''.join(random.choice(chars) for _ in range(length))
+        # secrets uses the OS random generator, which is what a password
+        # manager should use (random is predictable)
+        password = _random_string(chars, length)
         
         return password
     
+    def generate_passwords(self, count, length=16, use_uppercase=True, use_lowercase=True,
+                           use_digits=True, use_symbols=True):
+        """
+        Generate several random passwords with the same options
+        
+        Args:
+            count (int): How many passwords to generate
+            length (int): Length of each password
+            use_uppercase (bool): Include uppercase letters
+            use_lowercase (bool): Include lowercase letters
+            use_digits (bool): Include numbers
+            use_symbols (bool): Include special symbols
+            
+        Returns:
+            list: Generated passwords
+        """
+        chars = _charset(bool(use_uppercase), bool(use_lowercase),
+                         bool(use_digits), bool(use_symbols))
+        
+        return [_random_string(chars, length) for _ in range(count)]
+    
     def add_entry(self, website, username, password, notes=""):
         """Add a new password entry"""
         if not self.is_unlocked:
             raise Exception("Password manager is locked")
         
         # Check for duplicate entries
-        for entry in self.entries:
-            if entry.website.lower() == website.lower() and entry.username == username:
-                raise ValueError("Entry already exists for this website and username")
+        entries = self.entries  # makes sure the index is loaded
+        key = (website.lower(), username)
+        if key in self._index:
+            raise ValueError("Entry already exists for this website and username")
         
         # Encrypt the password before storing
         encrypted_password = self.encryption_manager.encrypt_password(password)
         
         # Create new entry with encrypted password
-        entry = PasswordEntry(website, username, encrypted_password, notes)
-        self.entries.append(entry)
+        entry = PasswordEntry.new(website, username, encrypted_password, notes)
+        self._index[key] = len(entries)
+        self._website_index.setdefault(key[0], []).append(len(entries))
+        entries.append(entry)
+        self._haystacks.append(entry._haystack_lc)
         
         # Save to file
-        self.save_entries()
+        self._mark_dirty()
         
         return True
     
@@ -158,22 +383,44 @@ class PasswordManager:
         
         entry = self.entries[index]
         
+        # Keep the lookup indexes in step with website/username changes
+        old_key = (entry.website.lower(), entry.username)
+        new_key = ((website if website is not None else entry.website).lower(),
+                   username if username is not None else entry.username)
+        if new_key != old_key:
+            if new_key in self._index:
+                raise ValueError("Entry already exists for this website and username")
+            del self._index[old_key]
+            self._index[new_key] = index
+        if new_key[0] != old_key[0]:
+            positions = self._website_index[old_key[0]]
+            positions.remove(index)
+            if not positions:
+                del self._website_index[old_key[0]]
+            bisect.insort(self._website_index.setdefault(new_key[0], []), index)
+        
         # Update fields if provided
         if website is not None:
             entry.website = website
         if username is not None:
             entry.username = username
         if password is not None:
+            # Old ciphertext is gone, so drop its cached plaintext
+            self.encryption_manager.forget_password(entry.password)
             # Encrypt new password
             entry.password = self.encryption_manager.encrypt_password(password)
         if notes is not None:
             entry.notes = notes
+        entry.refresh_search_key()
+        self._haystacks[index] = entry._haystack_lc
         
         # Update modified date
         entry.modified_date = datetime.now().isoformat()
+        # The cached to_dict() result is out of date now
+        entry._dict_cache = None
         
         # Save changes
-        self.save_entries()
+        self._mark_dirty()
         
         return True
     
@@ -186,66 +433,124 @@ class PasswordManager:
             raise IndexError("Invalid entry index")
         
         # Remove the entry
+        self.encryption_manager.forget_password(self.entries[index].password)
         del self.entries[index]
+        # Later entries have shifted down by one
+        self._rebuild_index()
         
         # Save changes
-        self.save_entries()
+        self._mark_dirty()
         
         return True
     
-    def get_entries(self, search_term=""):
+    def clear_entries(self):
+        """Delete every password entry"""
+        if not self.is_unlocked:
+            raise Exception("Password manager is locked")
+        
+        # Drop the cached plaintext of every removed password
+        for entry in self.entries:
+            self.encryption_manager.forget_password(entry.password)
+        self.entries = []
+        self._index = {}
+        self._website_index = {}
+        self._haystacks = []
+        
+        # Save changes
+        self._mark_dirty()
+        
+        return True
+    
+    def search_snapshot(self):
+        """
+        Copy the entry list and search column for a search on another thread
+        
+        PasswordManager isn't thread-safe, so this must be called on the
+        thread that changes the entries. It also loads them if needed.
+        
+        Returns:
+            tuple: (entries, haystacks) lists that later changes don't affect
+        """
+        if not self.is_unlocked:
+            raise Exception("Password manager is locked")
+        
+        entries = self.entries  # makes sure the search column is loaded
+        return list(entries), list(self._haystacks)
+    
+    def get_entries(self, search_term="", snapshot=None):
         """
         Get all entries or search for specific ones
         
         Args:
             search_term (str): Optional search term to filter entries
+            snapshot (tuple): Result of search_snapshot() to search instead
+                of the live entries (for searching off the main thread)
             
         Returns:
-            list: List of matching entries with decrypted passwords
+            list: List of (index, DecryptingView) tuples for matching entries
         """
         if not self.is_unlocked:
             raise Exception("Password manager is locked")
         
+        # Only plaintext fields are searched, so nothing is decrypted here
+        em = self.encryption_manager
+        if snapshot is None:
+            entries, haystacks = self.entries, self._haystacks
+        else:
+            entries, haystacks = snapshot
+        
         # If no search term, return all entries
         if not search_term:
-            return self.get_all_entries_decrypted()
+            return [(i, DecryptingView(entry, em)) for i, entry in enumerate(entries)]
         
-        # Search in website and username fields
+        # Search in website, username and notes fields
         search_lower = search_term.lower()
-        matching_entries = []
-        
-        for i, entry in enumerate(self.entries):
-            if (search_lower in entry.website.lower() or 
-                search_lower in entry.username.lower() or
-                search_lower in entry.notes.lower()):
-                # Create a copy with decrypted password
-                decrypted_entry = PasswordEntry(
-                    website=entry.website,
-                    username=entry.username,
-                    password=self.encryption_manager.decrypt_password(entry.password),
-                    notes=entry.notes,
-                    created_date=entry.created_date
-                )
-                matching_entries.append((i, decrypted_entry))
+        matching_entries = [
+            (i, DecryptingView(entries[i], em))
+            for i, haystack in enumerate(haystacks)
+            if search_lower in haystack
+        ]
         
         return matching_entries
     
-    def get_all_entries_decrypted(self):
-        """Get all entries with passwords decrypted"""
-        decrypted_entries = []
+    def find_by_website(self, website):
+        """
+        Get the entries for one website (exact match, ignoring case)
         
-        for i, entry in enumerate(self.entries):
-            # Create a copy with decrypted password
-            decrypted_entry = PasswordEntry(
-                website=entry.website,
-                username=entry.username,
-                password=self.encryption_manager.decrypt_password(entry.password),
-                notes=entry.notes,
-                created_date=entry.created_date
-            )
-            decrypted_entries.append((i, decrypted_entry))
-        
-        return decrypted_entries
+        Looks the website up in an index instead of scanning every entry
+        like get_entries does
+        
+        Args:
+            website (str): Website/service name
+            
+        Returns:
+            list: List of (index, DecryptingView) tuples, in vault order
+        """
+        if not self.is_unlocked:
+            raise Exception("Password manager is locked")
+        
+        entries = self.entries  # makes sure the index is loaded
+        em = self.encryption_manager
+        return [(i, DecryptingView(entries[i], em))
+                for i in self._website_index.get(website.lower(), ())]
+    
+    def get_all_entries_decrypted(self):
+        """Get all entries with passwords decrypted (in one bulk pass)"""
+        em = self.encryption_manager
+        passwords = em.decrypt_passwords([entry.password for entry in self.entries])
+        return [(i, DecryptingView(entry, em, password))
+                for i, (entry, password) in enumerate(zip(self.entries, passwords))]
+    
+    def _mark_dirty(self):
+        """Record that entries changed, saving straight away if autosave is on"""
+        self._dirty = True
+        if self.autosave:
+            self.flush()
+    
+    def flush(self):
+        """Write pending changes to disk (does nothing if there are none)"""
+        if self._dirty:
+            self.save_entries()
     
     def save_entries(self):
         """Save all entries to JSON file"""
@@ -256,9 +561,15 @@ class PasswordManager:
                 "last_modified": datetime.now().isoformat()
             }
             
-            # Write to file with pretty formatting
-            with open(self.passwords_file, 'w') as f:
-                json.dump(data, f, indent=4)
+            # Write to a temporary file first and then swap it in, so a
+            # crash half way through never leaves a truncated passwords file
+            temp_file = self.passwords_file + '.tmp'
+            with open(temp_file, 'wb') as f:
+                f.write(_dump_json(data))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_file, self.passwords_file)
+            self._dirty = False
                 
         except Exception as e:
             print(f"Error saving entries: {e}")
@@ -275,8 +586,8 @@ class PasswordManager:
                 return
             
             # Load from file
-            with open(self.passwords_file, 'r') as f:
-                data = json.load(f)
+            with open(self.passwords_file, 'rb') as f:
+                data = _load_json(f.read())
             
             # Convert dictionaries back to PasswordEntry objects
             self.entries = []
@@ -291,6 +602,8 @@ class PasswordManager:
         except Exception as e:
             print(f"Error loading entries: {e}")
             self.entries = []
+        finally:
+            self._rebuild_index()
 
 
 # Test code for development
@@ -6,6 +6,7 @@ from .gui import (
     PasswordManagerGUI,
     LoginWindow,
     PasswordGeneratorDialog,
+    GeneratorState,
     AddEditDialog,
     ColorScheme,
     colors,
@@ -22,6 +23,7 @@ __all__ = [
     'PasswordManagerGUI',
     'LoginWindow',
     'PasswordGeneratorDialog',
+    'GeneratorState',
     'AddEditDialog',
     
     # Alternative macOS implementations
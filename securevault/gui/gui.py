@@ -9,20 +9,66 @@ This was challenging to create - I had to learn about:
 - Input validation
 """
 
+import functools
+from concurrent.futures import ThreadPoolExecutor
 import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog
-from tkinter import font as tkfont
+from tkinter import ttk, messagebox
 import platform
-import subprocess
 
-# For copying to clipboard - will need to install with pip
-try:
-    import pyperclip
-    CLIPBOARD_AVAILABLE = True
-except ImportError:
-    CLIPBOARD_AVAILABLE = False
-    print("Warning: pyperclip not installed. Copy to clipboard will not work.")
-    print("Install with: pip install pyperclip")
+
+@functools.lru_cache(maxsize=1)
+def _get_pyperclip():
+    """Import pyperclip the first time the clipboard is needed
+    
+    pyperclip probes for clipboard tools when imported, so this keeps that
+    cost off startup. Only tried once per process.
+    
+    Returns:
+        module: The pyperclip module, or None if it isn't installed
+    """
+    # For copying to clipboard - will need to install with pip
+    try:
+        import pyperclip
+        return pyperclip
+    except ImportError:
+        print("Warning: pyperclip not installed. Copy to clipboard will not work.")
+        print("Install with: pip install pyperclip")
+        return None
+
+# The platform can't change while we're running, so look it up once
+_SYSTEM = platform.system()
+_IS_MACOS = _SYSTEM == "Darwin"
+
+
+def _macos_dark_mode():
+    """Read the macOS appearance preference straight from CoreFoundation
+    
+    Same setting as `defaults read -g AppleInterfaceStyle` but without
+    spawning a process. The key only exists when dark mode is on.
+    
+    Returns:
+        bool: True if the system is in dark mode
+    """
+    import ctypes
+    cf = ctypes.CDLL('/System/Library/Frameworks/CoreFoundation.framework/CoreFoundation')
+    cf.CFStringCreateWithCString.restype = ctypes.c_void_p
+    cf.CFStringCreateWithCString.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_uint32]
+    cf.CFPreferencesCopyAppValue.restype = ctypes.c_void_p
+    cf.CFPreferencesCopyAppValue.argtypes = [ctypes.c_void_p, ctypes.c_void_p]
+    cf.CFRelease.argtypes = [ctypes.c_void_p]
+    
+    utf8 = 0x08000100  # kCFStringEncodingUTF8
+    key = cf.CFStringCreateWithCString(None, b"AppleInterfaceStyle", utf8)
+    app = cf.CFStringCreateWithCString(None, b".GlobalPreferences", utf8)
+    try:
+        value = cf.CFPreferencesCopyAppValue(key, app)
+        if value is None:
+            return False
+        cf.CFRelease(value)
+        return True
+    finally:
+        cf.CFRelease(key)
+        cf.CFRelease(app)
 
 
 # Dark mode detection and color schemes
@@ -30,26 +76,35 @@ class ColorScheme:
     """Color schemes for light and dark modes"""
     
     @staticmethod
+    @functools.lru_cache(maxsize=1)
     def is_dark_mode():
-        """Detect if system is in dark mode"""
-        system = platform.system()
+        """Detect if system is in dark mode (checked once per process)"""
+        system = _SYSTEM
         
         if system == "Darwin":  # macOS
             try:
-                result = subprocess.run(
+                return _macos_dark_mode()
+            except Exception:
+                pass
+            # Fall back to asking the defaults tool (much slower - starts a process)
+            try:
+                import subprocess
+                # Fails with a non-zero exit code when the key isn't set (light mode)
+                output = subprocess.check_output(
                     ["defaults", "read", "-g", "AppleInterfaceStyle"],
-                    capture_output=True,
+                    stderr=subprocess.DEVNULL,
                     text=True
                 )
-                return result.returncode == 0 and "Dark" in result.stdout
+                return "Dark" in output
             except:
                 return False
         elif system == "Windows":
             try:
                 import winreg
-                registry = winreg.ConnectRegistry(None, winreg.HKEY_CURRENT_USER)
-                key = winreg.OpenKey(registry, r"Software\Microsoft\Windows\CurrentVersion\Themes\Personalize")
-                value, _ = winreg.QueryValueEx(key, "AppsUseLightTheme")
+                # HKCU can be opened directly, and the with block closes the key
+                with winreg.OpenKey(winreg.HKEY_CURRENT_USER,
+                                    r"Software\Microsoft\Windows\CurrentVersion\Themes\Personalize") as key:
+                    value, _ = winreg.QueryValueEx(key, "AppsUseLightTheme")
                 return value == 0
             except:
                 return False
@@ -107,9 +162,100 @@ class ColorScheme:
 # Global color scheme instance
 colors = ColorScheme()
 
+# Background color for each button type
+_BUTTON_BG = {
+    "success": colors.success_bg,
+    "error": colors.error_bg,
+    "info": colors.info_bg,
+    "default": colors.button_bg
+}
+
+# Complete button config for each type, built once instead of per button
+if _IS_MACOS:
+    # On macOS, we need to be more aggressive with styling
+    _BUTTON_CFG = {
+        button_type: {
+            "bg": bg,
+            "fg": colors.button_fg,
+            "activebackground": colors.button_hover,
+            "activeforeground": colors.button_fg,
+            "highlightbackground": bg,
+            "highlightcolor": bg,
+            "borderwidth": 0,
+            "highlightthickness": 0,
+            "relief": "flat",
+            "padx": 10,
+            "pady": 5
+        }
+        for button_type, bg in _BUTTON_BG.items()
+    }
+else:
+    _BUTTON_CFG = {
+        button_type: {
+            "bg": bg,
+            "fg": colors.button_fg,
+            "activebackground": colors.button_hover,
+            "activeforeground": colors.button_fg,
+            "relief": "raised",
+            "borderwidth": 2,
+            "highlightthickness": 0
+        }
+        for button_type, bg in _BUTTON_BG.items()
+    }
+
+# Treeview theme, built once at import
+_TREE_STYLE = {
+    "Treeview": dict(background=colors.tree_bg,
+                     foreground=colors.tree_fg,
+                     fieldbackground=colors.tree_bg),
+    "Treeview.Heading": dict(background=colors.frame_bg,
+                             foreground=colors.fg),
+}
+_TREE_STYLE_MAP = dict(background=[('selected', colors.tree_selected)],
+                       foreground=[('selected', colors.tree_selected_fg)])
+
+# Theme options shared by plain form labels
+_LABEL_KW = dict(bg=colors.bg, fg=colors.label_fg)
+
+# Theme options shared by every checkbutton
+_CHECKBTN_KW = dict(bg=colors.bg, fg=colors.label_fg,
+                    activebackground=colors.bg,
+                    selectcolor=colors.entry_bg,
+                    activeforeground=colors.fg)
+
+
+# ttk style names for themed entry widgets (configured by _init_styles)
+ENTRY_STYLE = "SecureVault.TEntry"
+SPINBOX_STYLE = "SecureVault.TSpinbox"
+
+
+def _init_styles(style):
+    """Configure the shared entry styles once on a ttk.Style
+    
+    Args:
+        style (ttk.Style): Style database of the application root
+    """
+    for name in (ENTRY_STYLE, SPINBOX_STYLE):
+        style.configure(name,
+                        fieldbackground=colors.entry_bg,
+                        foreground=colors.entry_fg,
+                        insertcolor=colors.entry_fg,
+                        bordercolor=colors.entry_border,
+                        lightcolor=colors.entry_border,
+                        darkcolor=colors.entry_border,
+                        borderwidth=1)
+        # Highlight the border of the focused field
+        style.map(name,
+                  bordercolor=[('focus', colors.button_bg)],
+                  lightcolor=[('focus', colors.button_bg)])
+
 
 def style_entry(entry_widget):
-    """Apply consistent styling to entry widgets with proper borders"""
+    """
+    Apply consistent styling to plain tk text widgets with proper borders
+    
+    ttk entries use ENTRY_STYLE instead; this is for tk.Text (the Notes box)
+    """
     entry_widget.config(
         bg=colors.entry_bg,
         fg=colors.entry_fg,
@@ -122,44 +268,26 @@ def style_entry(entry_widget):
     )
 
 
+def center_on_screen(window, width, height):
+    """Give a fixed-size window its geometry, centered on the screen
+    
+    The size is known up front, so there is no need to flush pending
+    layout with update_idletasks() just to measure the window.
+    
+    Args:
+        window: Toplevel window to place
+        width (int): Window width in pixels
+        height (int): Window height in pixels
+    """
+    x = (window.winfo_screenwidth() - width) // 2
+    y = (window.winfo_screenheight() - height) // 2
+    window.geometry(f'{width}x{height}+{x}+{y}')
+
+
 def style_button(button_widget, button_type="default"):
     """Apply consistent styling to buttons with proper colors"""
-    if button_type == "success":
-        bg = colors.success_bg
-    elif button_type == "error":
-        bg = colors.error_bg
-    elif button_type == "info":
-        bg = colors.info_bg
-    else:
-        bg = colors.button_bg
-    
-    # Force button styling even on macOS
-    import platform
-    if platform.system() == "Darwin":
-        # On macOS, we need to be more aggressive with styling
-        button_widget.config(
-            bg=bg,
-            fg=colors.button_fg,
-            activebackground=colors.button_hover,
-            activeforeground=colors.button_fg,
-            highlightbackground=bg,
-            highlightcolor=bg,
-            borderwidth=0,
-            highlightthickness=0,
-            relief="flat",
-            padx=10,
-            pady=5
-        )
-    else:
-        button_widget.config(
-            bg=bg,
-            fg=colors.button_fg,
-            activebackground=colors.button_hover,
-            activeforeground=colors.button_fg,
-            relief="raised",
-            borderwidth=2,
-            highlightthickness=0
-        )
+    # Unknown types get the default style
+    button_widget.config(**_BUTTON_CFG.get(button_type, _BUTTON_CFG["default"]))
 
 
 class CustomButton(tk.Frame):
@@ -169,43 +297,43 @@ class CustomButton(tk.Frame):
         super().__init__(parent, **kwargs)
         
         # Determine colors based on button type
-        if button_type == "success":
-            self.bg_color = colors.success_bg
-        elif button_type == "error":
-            self.bg_color = colors.error_bg
-        elif button_type == "info":
-            self.bg_color = colors.info_bg
-        else:
-            self.bg_color = colors.button_bg
+        self.bg_color = _BUTTON_BG.get(button_type, colors.button_bg)
         
         self.fg_color = colors.button_fg
         self.hover_color = colors.button_hover
         self.command = command
         
+        # Hover/rest configs, built once instead of on every mouse move
+        self._hover_self = {"bg": self.hover_color, "relief": "solid", "borderwidth": 2}
+        self._rest_self = {"bg": self.bg_color, "relief": "raised", "borderwidth": 1}
+        self._hover_label = {"bg": self.hover_color}
+        self._rest_label = {"bg": self.bg_color}
+        
         # Configure frame
-        self.config(bg=self.bg_color, relief="raised", borderwidth=1)
+        self.config(**self._rest_self)
         
         # Create label
         self.label = tk.Label(self, text=text, bg=self.bg_color, fg=self.fg_color,
                              padx=20 if not width else width//2, pady=5, cursor="hand2")
         self.label.pack(fill="both", expand=True)
+        # Route the label's events through the frame's bindings so
+        # each event only needs to be bound once
+        self.label.bindtags((str(self),) + self.label.bindtags()[1:])
         
         # Bind events
         self.bind_events()
     
     def bind_events(self):
         """Bind mouse events"""
+        # The label shares these through its bindtags
         # Mouse enter
         self.bind("<Enter>", self.on_enter)
-        self.label.bind("<Enter>", self.on_enter)
         
         # Mouse leave
         self.bind("<Leave>", self.on_leave)
-        self.label.bind("<Leave>", self.on_leave)
         
         # Click
         self.bind("<Button-1>", self.on_click)
-        self.label.bind("<Button-1>", self.on_click)
         
         # Key press (for accessibility)
         self.bind("<Return>", self.on_click)
@@ -213,13 +341,13 @@ class CustomButton(tk.Frame):
     
     def on_enter(self, event):
         """Handle mouse enter"""
-        self.config(bg=self.hover_color, relief="solid", borderwidth=2)
-        self.label.config(bg=self.hover_color)
+        self.config(**self._hover_self)
+        self.label.config(**self._hover_label)
     
     def on_leave(self, event):
         """Handle mouse leave"""
-        self.config(bg=self.bg_color, relief="raised", borderwidth=1)
-        self.label.config(bg=self.bg_color)
+        self.config(**self._rest_self)
+        self.label.config(**self._rest_label)
     
     def on_click(self, event):
         """Handle click"""
@@ -237,18 +365,22 @@ class CustomButton(tk.Frame):
         super().pack(**kwargs)
 
 
-def create_button(parent, text="", command=None, button_type="default", width=None, use_custom=None):
-    """Create a button - uses custom implementation on macOS to avoid white rectangle issue"""
-    if use_custom is None:
-        use_custom = platform.system() == "Darwin"
-    
-    if use_custom:
-        btn = CustomButton(parent, text=text, command=command, button_type=button_type, width=width)
-        return btn
-    else:
-        btn = tk.Button(parent, text=text, command=command, width=width)
-        style_button(btn, button_type)
-        return btn
+def _styled_tk_button(parent, text="", command=None, button_type="default", width=None):
+    """Create a regular tk.Button with the app styling applied"""
+    btn = tk.Button(parent, text=text, command=command, width=width)
+    style_button(btn, button_type)
+    return btn
+
+
+# Pick the button constructor once - the platform can't change at runtime.
+# macOS uses the custom implementation to avoid the white rectangle issue
+_BUTTON_FACTORY = CustomButton if _IS_MACOS else _styled_tk_button
+
+
+def create_button(parent, text="", command=None, button_type="default", width=None):
+    """Create a button suited to the current platform"""
+    return _BUTTON_FACTORY(parent, text=text, command=command,
+                           button_type=button_type, width=width)
 
 
 class LoginWindow:
@@ -258,15 +390,16 @@ class LoginWindow:
         self.parent = parent
         self.password_manager = password_manager
         self.on_success_callback = on_success_callback
-        self.window = tk.Toplevel(parent)
+        # Frame holding the current form (see _reset_content) and which
+        # form it is ("new" or "login")
+        self._content = None
+        self._form = None
+        # Color scheme applied when the window is created
+        self.window = tk.Toplevel(parent, background=colors.bg)
         self.window.title("SecureVault - Login")
-        self.window.geometry("400x300")
         self.window.resizable(False, False)
         
-        # Apply color scheme
-        self.window.configure(bg=colors.bg)
-        
-        # Center the window
+        # Size and center the window
         self.center_window()
         
         # Hide parent window
@@ -284,38 +417,33 @@ class LoginWindow:
         # Handle window close
         self.window.protocol("WM_DELETE_WINDOW", self.on_close)
         
-        # Ensure window is visible before grab
-        self.window.update()
-        self.window.deiconify()
-        
-        # Force window to front
-        self.window.lift()
-        self.window.attributes('-topmost', True)
+        # Force window to front (a single Tcl call - Tk maps the window
+        # itself once the event loop runs, no update()/deiconify() needed)
+        self.window.tk.call('wm', 'attributes', self.window._w, '-topmost', 1)
         
-        # Set up proper focus handling after window is visible
-        self.window.after(10, self._setup_window_focus)
+        # Set up proper focus handling once Tk has mapped the window
+        self.window.bind('<Map>', self._on_mapped, add='+')
     
     def center_window(self):
         """Center the window on screen"""
-        self.window.update_idletasks()
-        width = self.window.winfo_width()
-        height = self.window.winfo_height()
-        x = (self.window.winfo_screenwidth() // 2) - (width // 2)
-        y = (self.window.winfo_screenheight() // 2) - (height // 2)
-        self.window.geometry(f'{width}x{height}+{x}+{y}')
+        center_on_screen(self.window, 400, 300)
+    
+    def _on_mapped(self, event):
+        """Handle the window being mapped (shown) for the first time"""
+        # Child widgets' <Map> events also reach the toplevel's binding
+        if event.widget is not self.window:
+            return
+        self.window.unbind('<Map>')
+        self._setup_window_focus()
     
     def _setup_window_focus(self):
         """Set up window focus and grab after window is visible"""
         try:
-            # Wait for window to be visible
-            self.window.wait_visibility()
-            
             # Remove topmost after window is visible
             self.window.attributes('-topmost', False)
             
             # Check platform before using grab_set
-            import platform
-            if platform.system() != "Darwin":  # Not macOS
+            if not _IS_MACOS:
                 # Set grab for modal behavior (causes issues on macOS)
                 self.window.grab_set()
             
@@ -332,55 +460,63 @@ class LoginWindow:
         except Exception as e:
             print(f"Error setting up window focus: {e}")
 
+    def _reset_content(self):
+        """Replace the window contents with a fresh, empty frame"""
+        # Destroying the one frame removes every widget in it with a
+        # single Tcl call instead of one destroy() per widget
+        if self._content is not None:
+            self._content.destroy()
+        self._content = tk.Frame(self.window, bg=colors.bg)
+        self._content.pack(fill=tk.BOTH, expand=True)
+        return self._content
+    
     def setup_new_password(self):
         """Setup interface for creating new master password"""
+        bg, fg, lfg = colors.bg, colors.fg, colors.label_fg
         # Clear window
-        for widget in self.window.winfo_children():
-            widget.destroy()
+        content = self._reset_content()
+        self._form = "new"
         
         # Title
-        title_label = tk.Label(self.window, text="Welcome to SecureVault",
+        title_label = tk.Label(content, text="Welcome to SecureVault",
                               font=("Arial", 16, "bold"),
-                              bg=colors.bg, fg=colors.fg)
+                              bg=bg, fg=fg)
         title_label.pack(pady=20)
         
         # Instructions
-        info_label = tk.Label(self.window, 
+        info_label = tk.Label(content, 
                              text="Create a master password to secure your data.\n"
                                   "This password cannot be recovered if forgotten!",
                              wraplength=350,
-                             bg=colors.bg, fg=colors.label_fg)
+                             bg=bg, fg=lfg)
         info_label.pack(pady=10)
         
         # Password frame
-        pwd_frame = tk.Frame(self.window, bg=colors.bg)
+        pwd_frame = tk.Frame(content, bg=bg)
         pwd_frame.pack(pady=10)
         
         tk.Label(pwd_frame, text="Master Password:", 
-                bg=colors.bg, fg=colors.label_fg).grid(row=0, column=0, padx=5, pady=5)
-        self.password_entry = tk.Entry(pwd_frame, show="*", width=25)
-        style_entry(self.password_entry)
+                bg=bg, fg=lfg).grid(row=0, column=0, padx=5, pady=5)
+        self.password_entry = ttk.Entry(pwd_frame, show="*", width=25, style=ENTRY_STYLE)
         self.password_entry.grid(row=0, column=1, padx=5, pady=5)
         
         tk.Label(pwd_frame, text="Confirm Password:",
-                bg=colors.bg, fg=colors.label_fg).grid(row=1, column=0, padx=5, pady=5)
-        self.confirm_entry = tk.Entry(pwd_frame, show="*", width=25)
-        style_entry(self.confirm_entry)
+                bg=bg, fg=lfg).grid(row=1, column=0, padx=5, pady=5)
+        self.confirm_entry = ttk.Entry(pwd_frame, show="*", width=25, style=ENTRY_STYLE)
         self.confirm_entry.grid(row=1, column=1, padx=5, pady=5)
+        # Entries affected by "Show Password"
+        self._pwd_widgets = (self.password_entry, self.confirm_entry)
         
         # Show/Hide password checkbox
         self.show_pwd_var = tk.BooleanVar()
-        show_pwd_check = tk.Checkbutton(self.window, text="Show Password",
+        show_pwd_check = tk.Checkbutton(content, text="Show Password",
                                        variable=self.show_pwd_var,
                                        command=self.toggle_password_visibility,
-                                       bg=colors.bg, fg=colors.label_fg,
-                                       activebackground=colors.bg,
-                                       selectcolor=colors.entry_bg,
-                                       activeforeground=colors.fg)
+                                       **_CHECKBTN_KW)
         show_pwd_check.pack()
         
         # Create button
-        create_btn = create_button(self.window, text="Create Master Password",
+        create_btn = create_button(content, text="Create Master Password",
                                   command=self.create_master_password,
                                   button_type="success", width=20)
         create_btn.pack(pady=20)
@@ -390,39 +526,37 @@ class LoginWindow:
         
     def setup_login(self):
         """Setup interface for logging in"""
+        bg, fg, lfg = colors.bg, colors.fg, colors.label_fg
         # Clear window
-        for widget in self.window.winfo_children():
-            widget.destroy()
+        content = self._reset_content()
+        self._form = "login"
         
         # Title
-        title_label = tk.Label(self.window, text="SecureVault Login",
+        title_label = tk.Label(content, text="SecureVault Login",
                               font=("Arial", 16, "bold"),
-                              bg=colors.bg, fg=colors.fg)
+                              bg=bg, fg=fg)
         title_label.pack(pady=30)
         
         # Password frame
-        pwd_frame = tk.Frame(self.window, bg=colors.bg)
+        pwd_frame = tk.Frame(content, bg=bg)
         pwd_frame.pack(pady=20)
         
         tk.Label(pwd_frame, text="Master Password:",
-                bg=colors.bg, fg=colors.label_fg).pack(side=tk.LEFT, padx=5)
-        self.password_entry = tk.Entry(pwd_frame, show="*", width=25)
-        style_entry(self.password_entry)
+                bg=bg, fg=lfg).pack(side=tk.LEFT, padx=5)
+        self.password_entry = ttk.Entry(pwd_frame, show="*", width=25, style=ENTRY_STYLE)
         self.password_entry.pack(side=tk.LEFT, padx=5)
+        self._pwd_widgets = (self.password_entry,)
         
         # Show/Hide password checkbox
         self.show_pwd_var = tk.BooleanVar()
-        show_pwd_check = tk.Checkbutton(self.window, text="Show Password",
+        show_pwd_check = tk.Checkbutton(content, text="Show Password",
                                        variable=self.show_pwd_var,
                                        command=self.toggle_password_visibility,
-                                       bg=colors.bg, fg=colors.label_fg,
-                                       activebackground=colors.bg,
-                                       selectcolor=colors.entry_bg,
-                                       activeforeground=colors.fg)
+                                       **_CHECKBTN_KW)
         show_pwd_check.pack(pady=10)
         
         # Login button
-        login_btn = create_button(self.window, text="Unlock",
+        login_btn = create_button(content, text="Unlock",
                                  command=self.login,
                                  button_type="info", width=20)
         login_btn.pack(pady=10)
@@ -432,14 +566,9 @@ class LoginWindow:
         
     def toggle_password_visibility(self):
         """Toggle password visibility"""
-        if self.show_pwd_var.get():
-            self.password_entry.config(show="")
-            if hasattr(self, 'confirm_entry'):
-                self.confirm_entry.config(show="")
-        else:
-            self.password_entry.config(show="*")
-            if hasattr(self, 'confirm_entry'):
-                self.confirm_entry.config(show="*")
+        show = "" if self.show_pwd_var.get() else "*"
+        for entry in self._pwd_widgets:
+            entry.config(show=show)
     
     def create_master_password(self):
         """Handle master password creation"""
@@ -463,7 +592,7 @@ class LoginWindow:
             # Set the master password
             if self.password_manager.set_master_password(password):
                 messagebox.showinfo("Success", "Master password created successfully!")
-                self.window.destroy()
+                self.hide()
                 self.parent.deiconify()  # Show main window
                 if self.on_success_callback:
                     self.on_success_callback()  # Refresh entries
@@ -482,7 +611,7 @@ class LoginWindow:
         
         # Try to unlock
         if self.password_manager.unlock(password):
-            self.window.destroy()
+            self.hide()
             self.parent.deiconify()  # Show main window
             if self.on_success_callback:
                 self.on_success_callback()  # Refresh entries
@@ -491,19 +620,71 @@ class LoginWindow:
             self.password_entry.delete(0, tk.END)
             self.password_entry.focus()
     
+    def hide(self):
+        """Hide the window after a successful login (it is kept for reuse)"""
+        # Don't leave the master password in the hidden window
+        for entry in self._pwd_widgets:
+            entry.delete(0, tk.END)
+        self.window.grab_release()
+        self.window.withdraw()
+    
+    def show(self):
+        """Show the window again, e.g. after locking, with an empty login form"""
+        if self._form != "login":
+            self.setup_login()
+        else:
+            self.password_entry.delete(0, tk.END)
+            self.show_pwd_var.set(False)
+            self.toggle_password_visibility()
+        
+        self.parent.withdraw()
+        self.window.deiconify()
+        self.window.tk.call('wm', 'attributes', self.window._w, '-topmost', 1)
+        # Focus and grab again once it is visible
+        self.window.bind('<Map>', self._on_mapped, add='+')
+    
     def on_close(self):
         """Handle window close"""
         self.parent.quit()
 
 
+class GeneratorState:
+    """Tk variables holding the password generator options
+    
+    Owned by the main window and handed to every generator dialog, so the
+    variables are only created once and the last used options stick.
+    """
+    
+    def __init__(self, master=None):
+        self.length = tk.IntVar(master, value=16)
+        self.uppercase = tk.BooleanVar(master, value=True)
+        self.lowercase = tk.BooleanVar(master, value=True)
+        self.digits = tk.BooleanVar(master, value=True)
+        self.symbols = tk.BooleanVar(master, value=True)
+
+
 class PasswordGeneratorDialog:
     """Dialog for generating passwords"""
     
-    def __init__(self, parent):
+    def __init__(self, parent, password_manager=None, state=None):
+        """
+        Args:
+            parent: Parent window
+            password_manager (PasswordManager): Manager used to generate
+                passwords. A fresh one is made once if not given.
+            state (GeneratorState): Shared option variables. The dialog
+                makes its own if not given.
+        """
+        if password_manager is None:
+            # Import here to avoid circular import
+            from ..core.password_manager import PasswordManager
+            password_manager = PasswordManager()
+        self._pm = password_manager
+        
         self.result = None
         self.dialog = tk.Toplevel(parent)
         self.dialog.title("Password Generator")
-        self.dialog.geometry("400x350")
+        center_on_screen(self.dialog, 400, 350)
         self.dialog.resizable(False, False)
         
         # Apply color scheme
@@ -513,12 +694,18 @@ class PasswordGeneratorDialog:
         self.dialog.transient(parent)
         self.dialog.grab_set()
         
+        # Closing only hides the dialog so it can be shown again
+        self.dialog.protocol("WM_DELETE_WINDOW", self.close)
+        self._closed = tk.BooleanVar(self.dialog, value=False)
+        
         # Variables
-        self.length_var = tk.IntVar(value=16)
-        self.uppercase_var = tk.BooleanVar(value=True)
-        self.lowercase_var = tk.BooleanVar(value=True)
-        self.digits_var = tk.BooleanVar(value=True)
-        self.symbols_var = tk.BooleanVar(value=True)
+        if state is None:
+            state = GeneratorState(self.dialog)
+        self.length_var = state.length
+        self.uppercase_var = state.uppercase
+        self.lowercase_var = state.lowercase
+        self.digits_var = state.digits
+        self.symbols_var = state.symbols
         
         self.setup_ui()
         
@@ -539,9 +726,9 @@ class PasswordGeneratorDialog:
         
         tk.Label(length_frame, text="Password Length:",
                 bg=colors.bg, fg=colors.label_fg).pack(side=tk.LEFT, padx=5)
-        length_spinbox = tk.Spinbox(length_frame, from_=8, to=32,
-                                   textvariable=self.length_var, width=10)
-        style_entry(length_spinbox)
+        length_spinbox = ttk.Spinbox(length_frame, from_=8, to=32,
+                                    textvariable=self.length_var, width=10,
+                                    style=SPINBOX_STYLE)
         length_spinbox.pack(side=tk.LEFT, padx=5)
         
         # Character options
@@ -551,32 +738,22 @@ class PasswordGeneratorDialog:
         
         tk.Checkbutton(options_frame, text="Uppercase (A-Z)",
                       variable=self.uppercase_var,
-                      bg=colors.bg, fg=colors.label_fg,
-                      activebackground=colors.bg,
-                      selectcolor=colors.entry_bg,
-                      activeforeground=colors.fg).pack(anchor=tk.W)
+                      **_CHECKBTN_KW).pack(anchor=tk.W)
         tk.Checkbutton(options_frame, text="Lowercase (a-z)",
                       variable=self.lowercase_var,
-                      bg=colors.bg, fg=colors.label_fg,
-                      activebackground=colors.bg,
-                      selectcolor=colors.entry_bg,
-                      activeforeground=colors.fg).pack(anchor=tk.W)
+                      **_CHECKBTN_KW).pack(anchor=tk.W)
         tk.Checkbutton(options_frame, text="Digits (0-9)",
                       variable=self.digits_var,
-                      bg=colors.bg, fg=colors.label_fg,
-                      activebackground=colors.bg,
-                      selectcolor=colors.entry_bg,
-                      activeforeground=colors.fg).pack(anchor=tk.W)
+                      **_CHECKBTN_KW).pack(anchor=tk.W)
         tk.Checkbutton(options_frame, text="Symbols (!@#$%^&*)",
                       variable=self.symbols_var,
-                      bg=colors.bg, fg=colors.label_fg,
-                      activebackground=colors.bg,
-                      selectcolor=colors.entry_bg,
-                      activeforeground=colors.fg).pack(anchor=tk.W)
+                      **_CHECKBTN_KW).pack(anchor=tk.W)
         
         # Generated password display
-        self.password_display = tk.Entry(self.dialog, width=40, font=("Courier", 12))
-        style_entry(self.password_display)
+        self.password_var = tk.StringVar(self.dialog)
+        self.password_display = ttk.Entry(self.dialog, textvariable=self.password_var,
+                                          width=40, font=("Courier", 12),
+                                          style=ENTRY_STYLE)
         self.password_display.pack(pady=20)
         
         # Buttons
@@ -594,7 +771,7 @@ class PasswordGeneratorDialog:
         use_btn.pack(side=tk.LEFT, padx=5)
         
         cancel_btn = create_button(button_frame, text="Cancel",
-                                  command=self.dialog.destroy,
+                                  command=self.close,
                                   button_type="default")
         cancel_btn.pack(side=tk.LEFT, padx=5)
         
@@ -603,11 +780,7 @@ class PasswordGeneratorDialog:
     
     def generate_password(self):
         """Generate a new password"""
-        # Import here to avoid circular import
-        from ..core.password_manager import PasswordManager
-        pm = PasswordManager()
-        
-        password = pm.generate_password(
+        password = self._pm.generate_password(
             length=self.length_var.get(),
             use_uppercase=self.uppercase_var.get(),
             use_lowercase=self.lowercase_var.get(),
@@ -615,27 +788,60 @@ class PasswordGeneratorDialog:
             use_symbols=self.symbols_var.get()
         )
         
-        self.password_display.delete(0, tk.END)
-        self.password_display.insert(0, password)
+        # One Tcl set instead of a delete + insert on the entry
+        self.password_var.set(password)
     
     def use_password(self):
         """Use the generated password"""
-        self.result = self.password_display.get()
-        self.dialog.destroy()
+        self.result = self.password_var.get()
+        self.close()
+    
+    def show(self):
+        """Show the hidden dialog again with a fresh password"""
+        self.result = None
+        self.dialog.deiconify()
+        self.dialog.grab_set()
+        self.dialog.focus_force()
+        self.generate_password()
+    
+    def close(self):
+        """Hide the dialog and wake up anyone waiting on it"""
+        # Don't leave the generated password in the hidden dialog
+        self.password_var.set("")
+        self.dialog.grab_release()
+        self.dialog.withdraw()
+        self._closed.set(True)
+    
+    def wait(self):
+        """Block (while still handling events) until the dialog is closed"""
+        self.dialog.wait_variable(self._closed)
 
 
 class AddEditDialog:
-    """Dialog for adding or editing password entries"""
+    """Dialog for adding or editing password entries
     
-    def __init__(self, parent, password_manager, entry=None, index=None):
+    Closing the dialog only hides it, so the main window keeps one and
+    shows it again (with show()) for the next add or edit.
+    """
+    
+    # (label, attribute, entry options, columns spanned) for each entry row.
+    # The password row leaves the last column for the Generate button
+    _FIELDS = (
+        ("Website/Service:", "website_entry", {"width": 40}, 2),
+        ("Username/Email:", "username_entry", {"width": 40}, 2),
+        ("Password:", "password_entry", {"width": 30, "show": "*"}, 1),
+    )
+    
+    def __init__(self, parent, password_manager, entry=None, index=None, gen_state=None):
         self.password_manager = password_manager
-        self.entry = entry
-        self.index = index
         self.result = False
+        # Generator options shared with the main window (GeneratorState)
+        self._gen_state = gen_state
+        # Generator dialog, built on first use and then reused
+        self._gen_dialog = None
         
         self.dialog = tk.Toplevel(parent)
-        self.dialog.title("Edit Entry" if entry else "Add New Entry")
-        self.dialog.geometry("500x400")
+        center_on_screen(self.dialog, 500, 400)
         self.dialog.resizable(False, False)
         
         # Apply color scheme
@@ -645,14 +851,14 @@ class AddEditDialog:
         self.dialog.transient(parent)
         self.dialog.grab_set()
         
-        self.setup_ui()
+        # Closing only hides the dialog so it can be shown again
+        self.dialog.protocol("WM_DELETE_WINDOW", self.close)
+        self._closed = tk.BooleanVar(self.dialog, value=False)
+        # Pending close after a successful save
+        self._close_after_id = None
         
-        # Populate fields if editing
-        if entry:
-            self.website_entry.insert(0, entry.website)
-            self.username_entry.insert(0, entry.username)
-            self.password_entry.insert(0, entry.password)
-            self.notes_text.insert("1.0", entry.notes)
+        self.setup_ui()
+        self._load(entry, index)
         
         # Focus
         self.dialog.focus_force()
@@ -663,26 +869,13 @@ class AddEditDialog:
         main_frame = tk.Frame(self.dialog, padx=20, pady=20, bg=colors.bg)
         main_frame.pack(fill=tk.BOTH, expand=True)
         
-        # Website
-        tk.Label(main_frame, text="Website/Service:",
-                bg=colors.bg, fg=colors.label_fg).grid(row=0, column=0, sticky=tk.W, pady=5)
-        self.website_entry = tk.Entry(main_frame, width=40)
-        style_entry(self.website_entry)
-        self.website_entry.grid(row=0, column=1, columnspan=2, pady=5)
-        
-        # Username
-        tk.Label(main_frame, text="Username/Email:",
-                bg=colors.bg, fg=colors.label_fg).grid(row=1, column=0, sticky=tk.W, pady=5)
-        self.username_entry = tk.Entry(main_frame, width=40)
-        style_entry(self.username_entry)
-        self.username_entry.grid(row=1, column=1, columnspan=2, pady=5)
-        
-        # Password
-        tk.Label(main_frame, text="Password:",
-                bg=colors.bg, fg=colors.label_fg).grid(row=2, column=0, sticky=tk.W, pady=5)
-        self.password_entry = tk.Entry(main_frame, width=30, show="*")
-        style_entry(self.password_entry)
-        self.password_entry.grid(row=2, column=1, pady=5)
+        # Website, username and password rows
+        for row, (label_text, attr, entry_kw, span) in enumerate(self._FIELDS):
+            tk.Label(main_frame, text=label_text,
+                    **_LABEL_KW).grid(row=row, column=0, sticky=tk.W, pady=5)
+            entry = ttk.Entry(main_frame, style=ENTRY_STYLE, **entry_kw)
+            entry.grid(row=row, column=1, columnspan=span, pady=5)
+            setattr(self, attr, entry)
         
         # Generate button
         generate_btn = create_button(main_frame, text="Generate",
@@ -695,22 +888,14 @@ class AddEditDialog:
         show_pwd_check = tk.Checkbutton(main_frame, text="Show Password",
                                        variable=self.show_pwd_var,
                                        command=self.toggle_password,
-                                       bg=colors.bg, fg=colors.label_fg,
-                                       activebackground=colors.bg,
-                                       selectcolor=colors.entry_bg,
-                                       activeforeground=colors.fg)
+                                       **_CHECKBTN_KW)
         show_pwd_check.grid(row=3, column=1, sticky=tk.W, pady=5)
         
         # Notes
         tk.Label(main_frame, text="Notes:",
-                bg=colors.bg, fg=colors.label_fg).grid(row=4, column=0, sticky=tk.NW, pady=5)
-        self.notes_text = tk.Text(main_frame, width=40, height=5,
-                                bg=colors.entry_bg, fg=colors.entry_fg,
-                                insertbackground=colors.entry_fg,
-                                relief="solid", borderwidth=1,
-                                highlightthickness=2,
-                                highlightbackground=colors.entry_border,
-                                highlightcolor=colors.button_bg)
+                **_LABEL_KW).grid(row=4, column=0, sticky=tk.NW, pady=5)
+        self.notes_text = tk.Text(main_frame, width=40, height=5)
+        style_entry(self.notes_text)
         self.notes_text.grid(row=4, column=1, columnspan=2, pady=5)
         
         # Buttons
@@ -723,12 +908,79 @@ class AddEditDialog:
         save_btn.pack(side=tk.LEFT, padx=5)
         
         cancel_btn = create_button(button_frame, text="Cancel",
-                                  command=self.dialog.destroy,
+                                  command=self.close,
                                   button_type="default", width=10)
         cancel_btn.pack(side=tk.LEFT, padx=5)
         
-        # Focus on first field after a delay
-        self.dialog.after(100, lambda: self.website_entry.focus_force())
+        # Inline status - success is shown here instead of in a popup
+        self._status = tk.Label(main_frame, text="", bg=colors.bg, fg=colors.success_bg)
+        self._status.grid(row=6, column=0, columnspan=3)
+        
+        # Focus on first field once Tk has shown the dialog
+        self.dialog.bind('<Map>', self._initial_focus, add='+')
+    
+    def _initial_focus(self, event):
+        """Focus the first field when the dialog is mapped"""
+        # Child widgets' <Map> events also reach the toplevel's binding
+        if event.widget is not self.dialog:
+            return
+        self.dialog.unbind('<Map>')
+        self.website_entry.focus_force()
+    
+    def _load(self, entry, index):
+        """
+        Point the dialog at an entry to edit, or at a new entry
+        
+        Args:
+            entry: Entry to edit, or None to add a new one
+            index (int): Real index of the entry being edited
+        """
+        self.entry = entry
+        self.index = index
+        self.result = False
+        self.dialog.title("Edit Entry" if entry else "Add New Entry")
+        if entry:
+            self.website_entry.insert(0, entry.website)
+            self.username_entry.insert(0, entry.username)
+            self.password_entry.insert(0, entry.password)
+            self.notes_text.insert("1.0", entry.notes)
+    
+    def _clear_fields(self):
+        """Empty every field so nothing is left in the hidden dialog"""
+        for entry in (self.website_entry, self.username_entry, self.password_entry):
+            entry.delete(0, tk.END)
+        self.notes_text.delete("1.0", tk.END)
+        self._status.config(text="")
+        self.show_pwd_var.set(False)
+        self.toggle_password()
+    
+    def show(self, entry=None, index=None):
+        """
+        Show the hidden dialog again for another add or edit
+        
+        Args:
+            entry: Entry to edit, or None to add a new one
+            index (int): Real index of the entry being edited
+        """
+        self._load(entry, index)
+        self._closed.set(False)
+        self.dialog.deiconify()
+        self.dialog.grab_set()
+        self.website_entry.focus_force()
+    
+    def close(self):
+        """Clear and hide the dialog and wake up anyone waiting on it"""
+        if self._close_after_id is not None:
+            self.dialog.after_cancel(self._close_after_id)
+            self._close_after_id = None
+        self._clear_fields()
+        self.dialog.grab_release()
+        self.dialog.withdraw()
+        self._closed.set(True)
+    
+    def wait(self):
+        """Block (while still handling events) until the dialog is closed"""
+        self.dialog.wait_variable(self._closed)
     
     def toggle_password(self):
         """Toggle password visibility"""
@@ -739,8 +991,17 @@ class AddEditDialog:
     
     def generate_password(self):
         """Open password generator"""
-        gen_dialog = PasswordGeneratorDialog(self.dialog)
-        self.dialog.wait_window(gen_dialog.dialog)
+        gen_dialog = self._gen_dialog
+        if gen_dialog is None or not gen_dialog.dialog.winfo_exists():
+            gen_dialog = PasswordGeneratorDialog(self.dialog, self.password_manager,
+                                                 state=self._gen_state)
+            self._gen_dialog = gen_dialog
+        else:
+            gen_dialog.show()
+        gen_dialog.wait()
+        
+        # Take the modal grab back from the generator
+        self.dialog.grab_set()
         
         if gen_dialog.result:
             self.password_entry.delete(0, tk.END)
@@ -750,6 +1011,10 @@ class AddEditDialog:
     
     def save_entry(self):
         """Save the entry"""
+        # Already saved and about to close
+        if self.result:
+            return
+        
         # Get values
         website = self.website_entry.get().strip()
         username = self.username_entry.get().strip()
@@ -775,14 +1040,15 @@ class AddEditDialog:
                 self.password_manager.update_entry(
                     self.index, website, username, password, notes
                 )
-                messagebox.showinfo("Success", "Entry updated successfully")
+                self._status.config(text="Entry updated")
             else:
                 # Add new entry
                 self.password_manager.add_entry(website, username, password, notes)
-                messagebox.showinfo("Success", "Entry added successfully")
+                self._status.config(text="Entry added")
             
+            # Close shortly after so the message can be seen
             self.result = True
-            self.dialog.destroy()
+            self._close_after_id = self.dialog.after(800, self.close)
             
         except ValueError as e:
             messagebox.showerror("Error", str(e))
@@ -793,18 +1059,25 @@ class AddEditDialog:
 class PasswordManagerGUI:
     """Main GUI window for the password manager"""
     
+    # The main window's widgets are only built after the first login
+    _main_ui_built = False
+    # Treeview row height in pixels, read from the style in setup_styles
+    _row_height = 20
+    # Add/edit dialog, built on first use (see _open_entry_dialog)
+    _add_dialog = None
+    
     def __init__(self, root, password_manager):
         self.root = root
         self.password_manager = password_manager
+        # Generator options, kept for the whole session
+        self._gen_state = GeneratorState(root)
         
         # Setup styles
         self.setup_styles()
         
-        # Setup main UI first (but hidden)
-        self.setup_main_ui()
-        
-        # Create login window with callback to refresh entries after login
-        login_window = LoginWindow(root, password_manager, self.refresh_entries)
+        # Create login window with callback to build/refresh the main UI
+        # after login. It is hidden after logging in and shown again on lock
+        self._login = LoginWindow(root, password_manager, self._on_login)
         
         # Bind events
         self.root.protocol("WM_DELETE_WINDOW", self.on_close)
@@ -813,63 +1086,79 @@ class PasswordManagerGUI:
         """Setup custom styles"""
         style = ttk.Style()
         style.theme_use('clam')
+        _init_styles(style)
         
         # Configure window background
         self.root.configure(bg=colors.bg)
         
         # Configure Treeview colors based on theme
-        style.configure("Treeview", 
-                       background=colors.tree_bg,
-                       foreground=colors.tree_fg,
-                       fieldbackground=colors.tree_bg)
-        style.configure("Treeview.Heading", 
-                       background=colors.frame_bg,
-                       foreground=colors.fg)
-        style.map('Treeview', 
-                 background=[('selected', colors.tree_selected)],
-                 foreground=[('selected', colors.tree_selected_fg)])
+        for name, options in _TREE_STYLE.items():
+            style.configure(name, **options)
+        style.map('Treeview', **_TREE_STYLE_MAP)
+        
+        # Look this up once here instead of on every render/scroll
+        try:
+            self._row_height = int(style.lookup("Treeview", "rowheight"))
+        except (TypeError, ValueError):
+            self._row_height = 20
+    
+    def _on_login(self):
+        """Build the main window on the first login, then fill the list"""
+        if not self._main_ui_built:
+            self.setup_main_ui()
+            self._main_ui_built = True
+        self.refresh_entries()
     
     def setup_main_ui(self):
         """Setup the main window UI"""
+        # Look the colors up once instead of once per widget
+        bg, fg, lfg, fbg = colors.bg, colors.fg, colors.label_fg, colors.frame_bg
+        menu_kw = {"bg": fbg, "fg": fg,
+                   "activebackground": colors.button_hover,
+                   "activeforeground": colors.button_fg}
         # Menu bar
-        menubar = tk.Menu(self.root, bg=colors.frame_bg, fg=colors.fg,
-                         activebackground=colors.button_hover,
-                         activeforeground=colors.button_fg)
+        menubar = tk.Menu(self.root, **menu_kw)
         self.root.config(menu=menubar)
         
         # File menu
-        file_menu = tk.Menu(menubar, tearoff=0, bg=colors.frame_bg, fg=colors.fg,
-                           activebackground=colors.button_hover,
-                           activeforeground=colors.button_fg)
+        file_menu = tk.Menu(menubar, tearoff=0, **menu_kw)
         menubar.add_cascade(label="File", menu=file_menu)
         file_menu.add_command(label="Lock", command=self.lock_manager)
         file_menu.add_separator()
         file_menu.add_command(label="Exit", command=self.on_close)
         
         # Help menu
-        help_menu = tk.Menu(menubar, tearoff=0, bg=colors.frame_bg, fg=colors.fg,
-                           activebackground=colors.button_hover,
-                           activeforeground=colors.button_fg)
+        help_menu = tk.Menu(menubar, tearoff=0, **menu_kw)
         menubar.add_cascade(label="Help", menu=help_menu)
         help_menu.add_command(label="About", command=self.show_about)
         
         # Main frame
-        main_frame = tk.Frame(self.root, bg=colors.bg)
+        main_frame = tk.Frame(self.root, bg=bg)
         main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
         # Search frame
-        search_frame = tk.Frame(main_frame, bg=colors.bg)
+        search_frame = tk.Frame(main_frame, bg=bg)
         search_frame.pack(fill=tk.X, pady=(0, 10))
         
-        tk.Label(search_frame, text="Search:", bg=colors.bg, fg=colors.label_fg).pack(side=tk.LEFT, padx=5)
+        tk.Label(search_frame, text="Search:", bg=bg, fg=lfg).pack(side=tk.LEFT, padx=5)
         self.search_var = tk.StringVar()
-        self.search_var.trace("w", lambda *args: self.refresh_entries())
-        search_entry = tk.Entry(search_frame, textvariable=self.search_var, width=30)
-        style_entry(search_entry)
+        # Pending debounced refresh (see _on_search_changed)
+        self._search_after_id = None
+        # Searches run on one worker thread. Each refresh bumps the
+        # generation so results of an older search are thrown away
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._pending_future = None
+        self._search_generation = 0
+        # (lowercased term, results) of the last search shown, so a longer
+        # term typed after it only has to filter those results
+        self._search_memo = None
+        self.search_var.trace("w", self._on_search_changed)
+        search_entry = ttk.Entry(search_frame, textvariable=self.search_var, width=30,
+                                 style=ENTRY_STYLE)
         search_entry.pack(side=tk.LEFT, padx=5)
         
         # Buttons frame
-        button_frame = tk.Frame(main_frame, bg=colors.bg)
+        button_frame = tk.Frame(main_frame, bg=bg)
         button_frame.pack(fill=tk.X, pady=(0, 10))
         
         add_btn = create_button(button_frame, text="Add New",
@@ -898,18 +1187,37 @@ class PasswordManagerGUI:
         copy_user_btn.pack(side=tk.LEFT, padx=5)
         
         # Password list (Treeview)
-        tree_frame = tk.Frame(main_frame, bg=colors.bg)
+        tree_frame = tk.Frame(main_frame, bg=bg)
         tree_frame.pack(fill=tk.BOTH, expand=True)
         
+        # Only the rows that fit in the tree are inserted (see _render_window),
+        # so the scrollbar scrolls through _filtered_entries, not the tree
+        self._filtered_entries = []
+        # Entry shown by each rendered row, keyed by iid, so the selection
+        # handlers don't have to search (or decrypt) again
+        self._entry_map = {}
+        self._first_row = 0
+        self._rendered_rows = 0
+        # Rows currently in the tree: iid -> (ID text, values), in order
+        self._shown_rows = {}
+        self._shown_order = []
+        
         # Scrollbar
-        scrollbar = ttk.Scrollbar(tree_frame)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self._scrollbar = ttk.Scrollbar(tree_frame, command=self._on_scrollbar)
+        self._scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
         # Treeview
         self.tree = ttk.Treeview(tree_frame, columns=("Website", "Username", "Notes"),
-                                show="tree headings", yscrollcommand=scrollbar.set)
+                                show="tree headings")
         self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.config(command=self.tree.yview)
+        
+        # Re-window when resized or scrolled
+        self.tree.bind("<Configure>", self._on_tree_configure)
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Button-4>", lambda e: self._scroll_by(-3))
+        self.tree.bind("<Button-5>", lambda e: self._scroll_by(3))
+        self.tree.bind("<Up>", lambda e: self._on_arrow(-1))
+        self.tree.bind("<Down>", lambda e: self._on_arrow(1))
         
         # Configure columns
         self.tree.heading("#0", text="ID")
@@ -927,39 +1235,288 @@ class PasswordManagerGUI:
         
         # Status bar
         self.status_bar = tk.Label(main_frame, text="Ready", relief=tk.SUNKEN, anchor=tk.W,
-                                  bg=colors.frame_bg, fg=colors.fg)
+                                  bg=fbg, fg=fg)
         self.status_bar.pack(side=tk.BOTTOM, fill=tk.X, pady=(10, 0))
+        self._status_text = "Ready"
+        
+        # Pending clipboard clear after copying a password
+        self._clip_after_id = None
         
         # Don't refresh entries here - will be done after login
     
-    def refresh_entries(self):
-        """Refresh the password list"""
-        # Clear current items
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+    def _on_search_changed(self, *args):
+        """Refresh the list once typing pauses instead of on every keystroke"""
+        if self._search_after_id is not None:
+            self.root.after_cancel(self._search_after_id)
+        self._search_after_id = self.root.after(150, self._run_search)
+    
+    def _run_search(self):
+        """Run the debounced search refresh"""
+        self._search_after_id = None
+        self.refresh_entries(incremental=True)
+    
+    def refresh_entries(self, status=None, incremental=False):
+        """
+        Refresh the password list
+        
+        The search runs on a worker thread and the tree is updated from
+        the Tk thread once it finishes (see _poll_search).
+        
+        Args:
+            status (str): Message for the status bar once the list is
+                updated. Defaults to the number of entries shown.
+            incremental (bool): Allow narrowing the previous results when
+                the term only got longer. Only safe if the entries haven't
+                changed since, so it is only used while typing.
+        """
+        # A newer search makes any pending one pointless
+        if self._pending_future is not None:
+            self._pending_future.cancel()
+        self._search_generation += 1
+        
+        search_term = self.search_var.get()
+        memo = self._search_memo if incremental else None
+        # The worker only sees a copy taken here on the Tk thread, so adds,
+        # deletes and locks can't change the entries under it. Taking the
+        # copy also loads the entries here the first time after unlocking
+        try:
+            snapshot = self.password_manager.search_snapshot()
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to load entries: {str(e)}")
+            return
+        future = self._executor.submit(self._search, search_term, memo, snapshot)
+        self._pending_future = future
+        self.root.after(20, self._poll_search, future, self._search_generation, status)
+    
+    def _search(self, search_term, memo, snapshot):
+        """
+        Find the entries matching search_term (runs on the worker thread)
+        
+        Args:
+            search_term (str): Text typed in the search box
+            memo (tuple): (lowercased term, results) of an earlier search,
+                or None to search all entries
+            snapshot (tuple): PasswordManager.search_snapshot() taken on
+                the Tk thread
+            
+        Returns:
+            tuple: (lowercased term, list of (index, entry) tuples)
+        """
+        search_lower = search_term.lower()
+        if memo is not None:
+            last_lower, last_entries = memo
+            # "goo" can only match entries that "go" matched
+            if last_lower and search_lower.startswith(last_lower):
+                return search_lower, [(i, entry) for i, entry in last_entries
+                                      if entry.matches(search_lower)]
+        return search_lower, self.password_manager.get_entries(search_term, snapshot)
+    
+    def _poll_search(self, future, generation, status):
+        """Show the results of a background search once it is done"""
+        if generation != self._search_generation:
+            # Superseded by a newer search
+            return
+        if not future.done():
+            self.root.after(20, self._poll_search, future, generation, status)
+            return
+        self._pending_future = None
         
         try:
             # Get entries
-            search_term = self.search_var.get()
-            entries = self.password_manager.get_entries(search_term)
+            search_lower, entries = future.result()
+            self._search_memo = (search_lower, entries)
             
-            # Add to tree
-            for i, (index, entry) in enumerate(entries):
-                self.tree.insert("", "end", text=str(i+1),
-                               values=(entry.website, entry.username, entry.notes))
+            # Keep the full list and only put the visible part in the tree
+            self._filtered_entries = entries
+            self._render_window()
             
             # Update status
-            self.status_bar.config(text=f"Showing {len(entries)} entries")
+            self._set_status(status or f"Showing {len(entries)} entries")
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load entries: {str(e)}")
     
+    def _set_status(self, text):
+        """Show text in the status bar (skipped if it is already showing)"""
+        if text != self._status_text:
+            self._status_text = text
+            self.status_bar.config(text=text)
+    
+    def _visible_rows(self):
+        """Number of rows that fit in the tree at its current size"""
+        height = self.tree.winfo_height()
+        if height <= 1:
+            # Not laid out yet - <Configure> will re-window once it is
+            return 30
+        # One row's worth of space goes to the headings
+        return max(height // self._row_height - 1, 1)
+    
+    def _render_window(self):
+        """Insert only the rows of _filtered_entries that are on screen
+        
+        The iid of each row is "v" plus the entry's real index in the
+        password manager, and the ID column is its position in the
+        filtered list.
+        """
+        total = len(self._filtered_entries)
+        rows = self._visible_rows()
+        first = max(min(self._first_row, total - rows), 0)
+        last = min(first + rows, total)
+        self._first_row = first
+        self._rendered_rows = rows
+        
+        # What each row should show: iid -> (ID text, column values)
+        entry_map = {}
+        wanted = {}
+        order = []
+        for pos in range(first, last):
+            index, entry = self._filtered_entries[pos]
+            iid = f"v{index}"
+            entry_map[iid] = entry
+            wanted[iid] = (str(pos + 1), (entry.website, entry.username, entry.notes))
+            order.append(iid)
+        self._entry_map = entry_map
+        
+        # Only touch rows that changed. Rows are always in real index order,
+        # so rows that stay keep their order and new ones slot in by position
+        shown = self._shown_rows
+        kept = [iid for iid in self._shown_order if iid in wanted]
+        if kept == [iid for iid in order if iid in shown]:
+            stale = [iid for iid in self._shown_order if iid not in wanted]
+        else:
+            # Shouldn't happen, but fall back to a full rebuild if it does
+            stale = self._shown_order
+            shown = {}
+        if stale:
+            self.tree.delete(*stale)
+        
+        # Call the Tcl commands directly - Treeview.insert()/item() re-format
+        # their options through Python on every row
+        call = self.tree.tk.call
+        tree = self.tree._w
+        for pos, iid in enumerate(order):
+            text, values = wanted[iid]
+            old = shown.get(iid)
+            if old is None:
+                call(tree, "insert", "", pos, "-id", iid, "-text", text, "-values", values)
+            elif old != wanted[iid]:
+                call(tree, "item", iid, "-text", text, "-values", values)
+        
+        self._shown_rows = wanted
+        self._shown_order = order
+        
+        if total:
+            self._scrollbar.set(first / total, last / total)
+        else:
+            self._scrollbar.set(0, 1)
+    
+    def _forget_search(self):
+        """
+        Drop the results kept for incremental searching
+        
+        Called whenever the entries change: the kept results hold entry
+        indexes that may have shifted, so a debounced search typed just
+        before the change must not narrow them
+        """
+        self._search_memo = None
+    
+    def _clear_list(self):
+        """Empty the list and forget the results behind it"""
+        # Any search still running (or about to start) would refill it
+        self._search_generation += 1
+        if self._search_after_id is not None:
+            self.root.after_cancel(self._search_after_id)
+            self._search_after_id = None
+        children = self.tree.get_children()
+        if children:
+            # One Tcl call for all rows
+            self.tree.delete(*children)
+        self._filtered_entries = []
+        self._entry_map = {}
+        self._shown_rows = {}
+        self._shown_order = []
+        self._forget_search()
+        self._first_row = 0
+    
+    def _scroll_to(self, first):
+        """Show the window of rows starting at position first"""
+        total = len(self._filtered_entries)
+        first = max(min(first, total - self._rendered_rows), 0)
+        if first != self._first_row:
+            self._first_row = first
+            self._render_window()
+    
+    def _scroll_by(self, rows):
+        """Scroll the list by a number of rows"""
+        self._scroll_to(self._first_row + rows)
+        return "break"
+    
+    def _on_scrollbar(self, action, amount, unit=None):
+        """Handle the scrollbar's moveto/scroll commands"""
+        if action == "moveto":
+            self._scroll_to(int(float(amount) * len(self._filtered_entries)))
+        elif action == "scroll":
+            step = int(amount)
+            if unit == "pages":
+                step *= self._rendered_rows
+            self._scroll_by(step)
+    
+    def _on_mousewheel(self, event):
+        """Scroll with the mouse wheel (Windows/macOS)"""
+        return self._scroll_by(-3 if event.delta > 0 else 3)
+    
+    def _on_arrow(self, step):
+        """Scroll the window when moving the selection past its edge"""
+        focus = self.tree.focus()
+        children = self.tree.get_children()
+        if not focus or not children:
+            return None
+        edge = children[0] if step < 0 else children[-1]
+        if focus != edge:
+            # Normal Treeview handling moves within the window
+            return None
+        
+        self._scroll_by(step)
+        children = self.tree.get_children()
+        if children:
+            target = children[0] if step < 0 else children[-1]
+            self.tree.selection_set(target)
+            self.tree.focus(target)
+        return "break"
+    
+    def _on_tree_configure(self, event):
+        """Re-window when the tree is resized"""
+        if self._visible_rows() != self._rendered_rows:
+            self._render_window()
+    
+    def _open_entry_dialog(self, entry=None, index=None):
+        """
+        Show the add/edit dialog and wait for it to close
+        
+        The dialog is built on first use and then reused.
+        
+        Args:
+            entry: Entry to edit, or None to add a new one
+            index (int): Real index of the entry being edited
+        
+        Returns:
+            bool: True if the entry was saved
+        """
+        dialog = self._add_dialog
+        if dialog is None or not dialog.dialog.winfo_exists():
+            dialog = AddEditDialog(self.root, self.password_manager, entry, index,
+                                   gen_state=self._gen_state)
+            self._add_dialog = dialog
+        else:
+            dialog.show(entry, index)
+        dialog.wait()
+        return dialog.result
+    
     def add_entry(self):
         """Add a new password entry"""
-        dialog = AddEditDialog(self.root, self.password_manager)
-        self.root.wait_window(dialog.dialog)
-        
-        if dialog.result:
+        if self._open_entry_dialog():
+            # Earlier results are out of date (see _forget_search)
+            self._forget_search()
             self.refresh_entries()
     
     def edit_entry(self):
@@ -969,19 +1526,12 @@ class PasswordManagerGUI:
             messagebox.showwarning("Warning", "Please select an entry to edit")
             return
         
-        # Get the index
-        item = self.tree.item(selection[0])
-        index = int(item['text']) - 1
-        
-        # Get the actual entry
-        entries = self.password_manager.get_entries(self.search_var.get())
-        if index < len(entries):
-            real_index, entry = entries[index]
-            
-            dialog = AddEditDialog(self.root, self.password_manager, entry, real_index)
-            self.root.wait_window(dialog.dialog)
-            
-            if dialog.result:
+        # The row iid is "v" + the entry's real index
+        entry = self._entry_map.get(selection[0])
+        if entry is not None:
+            real_index = int(selection[0][1:])
+            if self._open_entry_dialog(entry, real_index):
+                self._forget_search()
                 self.refresh_entries()
     
     def delete_entry(self):
@@ -996,65 +1546,72 @@ class PasswordManagerGUI:
                                   "Are you sure you want to delete this entry?"):
             return
         
-        # Get the index
-        item = self.tree.item(selection[0])
-        index = int(item['text']) - 1
-        
-        # Get the actual entry index
-        entries = self.password_manager.get_entries(self.search_var.get())
-        if index < len(entries):
-            real_index, _ = entries[index]
-            
+        # The row iid is "v" + the entry's real index
+        if selection[0] in self._entry_map:
+            real_index = int(selection[0][1:])
             try:
                 self.password_manager.delete_entry(real_index)
-                self.refresh_entries()
-                messagebox.showinfo("Success", "Entry deleted successfully")
+                self._forget_search()
+                self.refresh_entries(status="Entry deleted")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to delete entry: {str(e)}")
     
-    def copy_password(self):
-        """Copy password to clipboard"""
+    def _selected_entry(self):
+        """
+        Get the entry shown in the selected row, warning if there is none
+        
+        Returns:
+            The entry (from _entry_map, no tree.item() lookup), or None
+        """
         selection = self.tree.selection()
         if not selection:
             messagebox.showwarning("Warning", "Please select an entry")
-            return
-        
-        # Get the index
-        item = self.tree.item(selection[0])
-        index = int(item['text']) - 1
-        
-        # Get the entry
-        entries = self.password_manager.get_entries(self.search_var.get())
-        if index < len(entries):
-            _, entry = entries[index]
-            
-            if CLIPBOARD_AVAILABLE:
+            return None
+        return self._entry_map.get(selection[0])
+    
+    def copy_password(self):
+        """Copy password to clipboard"""
+        entry = self._selected_entry()
+        if entry is not None:
+            pyperclip = _get_pyperclip()
+            if pyperclip is not None:
                 try:
                     pyperclip.copy(entry.password)
-                    self.status_bar.config(text="Password copied to clipboard")
-                    # Clear clipboard after 30 seconds for security
-                    self.root.after(30000, lambda: pyperclip.copy(""))
+                    self._set_status("Password copied to clipboard")
+                    # Clear clipboard after 30 seconds for security. Only the
+                    # latest copy's timer is kept, so an older one can't
+                    # clear the clipboard early
+                    if self._clip_after_id is not None:
+                        self.root.after_cancel(self._clip_after_id)
+                    self._clip_after_id = self.root.after(30000, self._clear_clipboard)
                 except Exception as e:
                     messagebox.showerror("Error", f"Failed to copy: {str(e)}")
             else:
                 # Show password in a dialog if clipboard not available
                 messagebox.showinfo("Password", f"Password: {entry.password}\n\nNote: Install pyperclip for clipboard support")
     
+    def _clear_clipboard(self):
+        """Wipe a copied password from the clipboard"""
+        self._clip_after_id = None
+        pyperclip = _get_pyperclip()
+        if pyperclip is not None:
+            try:
+                pyperclip.copy("")
+            except Exception:
+                pass
+    
     def copy_username(self):
         """Copy username to clipboard"""
-        selection = self.tree.selection()
-        if not selection:
-            messagebox.showwarning("Warning", "Please select an entry")
+        entry = self._selected_entry()
+        if entry is None:
             return
+        username = entry.username
         
-        # Get the values directly from tree
-        item = self.tree.item(selection[0])
-        username = item['values'][1]  # Username is second value
-        
-        if CLIPBOARD_AVAILABLE:
+        pyperclip = _get_pyperclip()
+        if pyperclip is not None:
             try:
                 pyperclip.copy(username)
-                self.status_bar.config(text="Username copied to clipboard")
+                self._set_status("Username copied to clipboard")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to copy: {str(e)}")
         else:
@@ -1063,9 +1620,15 @@ class PasswordManagerGUI:
     
     def lock_manager(self):
         """Lock the password manager"""
-        self.password_manager.lock()
+        try:
+            self.password_manager.lock()
+        except Exception as e:
+            # lock() still locked the vault - only the last save failed
+            messagebox.showerror("Error", f"Failed to save entries before locking: {str(e)}")
         self.root.withdraw()
-        LoginWindow(self.root, self.password_manager, self.refresh_entries)
+        # Don't leave the vault's contents sitting in the hidden window
+        self._clear_list()
+        self._login.show()
     
     def show_about(self):
         """Show about dialog"""
@@ -1084,6 +1647,13 @@ using encryption to protect your sensitive data.
     def on_close(self):
         """Handle window close"""
         if messagebox.askyesno("Exit", "Are you sure you want to exit?"):
+            # Write out anything that hasn't been saved yet
+            try:
+                self.password_manager.flush()
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to save entries: {str(e)}")
+            if self._main_ui_built:
+                self._executor.shutdown(wait=False)
             self.root.quit()
 
 
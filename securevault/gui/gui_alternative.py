@@ -4,11 +4,10 @@ This version uses a different approach to modal windows to avoid input issues
 """
 
 import tkinter as tk
-from tkinter import messagebox
-import platform
+from tkinter import ttk, messagebox
 
 # Import the existing GUI module to reuse most components
-from .gui import colors, PasswordGeneratorDialog, AddEditDialog, PasswordManagerGUI as BasePasswordManagerGUI, style_button, create_button
+from .gui import colors, PasswordGeneratorDialog, AddEditDialog, PasswordManagerGUI as BasePasswordManagerGUI, style_button, create_button, _CHECKBTN_KW, ENTRY_STYLE, center_on_screen, GeneratorState, _IS_MACOS
 
 
 class MacOSLoginWindow:
@@ -18,11 +17,13 @@ class MacOSLoginWindow:
         self.parent = parent
         self.password_manager = password_manager
         self.on_success_callback = on_success_callback
+        # Frame holding the current form and which form it is ("new"/"login")
+        self._container = None
+        self._form = None
         
         # Create window but don't use Toplevel
         self.window = tk.Toplevel(parent)
         self.window.title("SecureVault - Login")
-        self.window.geometry("400x300")
         self.window.resizable(False, False)
         
         # Apply color scheme
@@ -43,8 +44,10 @@ class MacOSLoginWindow:
         # Handle window close
         self.window.protocol("WM_DELETE_WINDOW", self.on_close)
         
-        # macOS specific: Use update and lift without grab_set
-        self.window.update()
+        # macOS specific: lift without grab_set. update_idletasks() only
+        # flushes pending redraws - update() would also dispatch user
+        # events and could re-enter our callbacks during setup
+        self.window.update_idletasks()
         self.window.lift()
         
         # Focus without grab - this often works better on macOS
@@ -53,18 +56,21 @@ class MacOSLoginWindow:
     
     def center_window(self):
         """Center the window on screen"""
-        self.window.update_idletasks()
-        width = 400
-        height = 300
-        x = (self.window.winfo_screenwidth() // 2) - (width // 2)
-        y = (self.window.winfo_screenheight() // 2) - (height // 2)
-        self.window.geometry(f'{width}x{height}+{x}+{y}')
+        center_on_screen(self.window, 400, 300)
+    
+    def _new_container(self):
+        """Replace the previous form (if any) with an empty container frame"""
+        if self._container is not None:
+            self._container.destroy()
+        self._container = tk.Frame(self.window, bg=colors.bg)
+        self._container.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+        return self._container
     
     def setup_new_password(self):
         """Setup interface for creating new master password"""
         # Main container frame
-        container = tk.Frame(self.window, bg=colors.bg)
-        container.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+        container = self._new_container()
+        self._form = "new"
         
         # Title
         title_label = tk.Label(container, text="Welcome to SecureVault",
@@ -87,36 +93,25 @@ class MacOSLoginWindow:
         # Master password
         tk.Label(fields_frame, text="Master Password:", 
                 bg=colors.bg, fg=colors.label_fg).grid(row=0, column=0, sticky='e', padx=(0, 10), pady=5)
-        self.password_entry = tk.Entry(fields_frame, show="*", width=25,
-                                     bg=colors.entry_bg, fg=colors.entry_fg,
-                                     insertbackground=colors.entry_fg,
-                                     relief="solid", borderwidth=1,
-                                     highlightthickness=2,
-                                     highlightbackground=colors.entry_border,
-                                     highlightcolor=colors.button_bg)
+        self.password_entry = ttk.Entry(fields_frame, show="*", width=25,
+                                        style=ENTRY_STYLE)
         self.password_entry.grid(row=0, column=1, pady=5)
         
         # Confirm password
         tk.Label(fields_frame, text="Confirm Password:",
                 bg=colors.bg, fg=colors.label_fg).grid(row=1, column=0, sticky='e', padx=(0, 10), pady=5)
-        self.confirm_entry = tk.Entry(fields_frame, show="*", width=25,
-                                    bg=colors.entry_bg, fg=colors.entry_fg,
-                                    insertbackground=colors.entry_fg,
-                                    relief="solid", borderwidth=1,
-                                    highlightthickness=2,
-                                    highlightbackground=colors.entry_border,
-                                    highlightcolor=colors.button_bg)
+        self.confirm_entry = ttk.Entry(fields_frame, show="*", width=25,
+                                       style=ENTRY_STYLE)
         self.confirm_entry.grid(row=1, column=1, pady=5)
+        # Entries affected by "Show Password"
+        self._pwd_widgets = (self.password_entry, self.confirm_entry)
         
         # Show/Hide password
         self.show_pwd_var = tk.BooleanVar()
         show_check = tk.Checkbutton(container, text="Show Password",
                                    variable=self.show_pwd_var,
                                    command=self.toggle_password_visibility,
-                                   bg=colors.bg, fg=colors.label_fg,
-                                   activebackground=colors.bg,
-                                   selectcolor=colors.entry_bg,
-                                   activeforeground=colors.fg)
+                                   **_CHECKBTN_KW)
         show_check.pack(pady=(0, 20))
         
         # Create button
@@ -134,8 +129,8 @@ class MacOSLoginWindow:
     def setup_login(self):
         """Setup interface for logging in"""
         # Main container
-        container = tk.Frame(self.window, bg=colors.bg)
-        container.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+        container = self._new_container()
+        self._form = "login"
         
         # Title
         title_label = tk.Label(container, text="SecureVault Login",
@@ -149,24 +144,17 @@ class MacOSLoginWindow:
         
         tk.Label(field_frame, text="Master Password:",
                 bg=colors.bg, fg=colors.label_fg).pack(side=tk.LEFT, padx=(0, 10))
-        self.password_entry = tk.Entry(field_frame, show="*", width=25,
-                                     bg=colors.entry_bg, fg=colors.entry_fg,
-                                     insertbackground=colors.entry_fg,
-                                     relief="solid", borderwidth=1,
-                                     highlightthickness=2,
-                                     highlightbackground=colors.entry_border,
-                                     highlightcolor=colors.button_bg)
+        self.password_entry = ttk.Entry(field_frame, show="*", width=25,
+                                        style=ENTRY_STYLE)
         self.password_entry.pack(side=tk.LEFT)
+        self._pwd_widgets = (self.password_entry,)
         
         # Show/Hide password
         self.show_pwd_var = tk.BooleanVar()
         show_check = tk.Checkbutton(container, text="Show Password",
                                    variable=self.show_pwd_var,
                                    command=self.toggle_password_visibility,
-                                   bg=colors.bg, fg=colors.label_fg,
-                                   activebackground=colors.bg,
-                                   selectcolor=colors.entry_bg,
-                                   activeforeground=colors.fg)
+                                   **_CHECKBTN_KW)
         show_check.pack(pady=(0, 20))
         
         # Login button
@@ -183,14 +171,9 @@ class MacOSLoginWindow:
     
     def toggle_password_visibility(self):
         """Toggle password visibility"""
-        if self.show_pwd_var.get():
-            self.password_entry.config(show="")
-            if hasattr(self, 'confirm_entry'):
-                self.confirm_entry.config(show="")
-        else:
-            self.password_entry.config(show="*")
-            if hasattr(self, 'confirm_entry'):
-                self.confirm_entry.config(show="*")
+        show = "" if self.show_pwd_var.get() else "*"
+        for entry in self._pwd_widgets:
+            entry.config(show=show)
     
     def create_master_password(self):
         """Handle master password creation"""
@@ -212,7 +195,7 @@ class MacOSLoginWindow:
         try:
             if self.password_manager.set_master_password(password):
                 messagebox.showinfo("Success", "Master password created successfully!")
-                self.window.destroy()
+                self.hide()
                 self.parent.deiconify()
                 if self.on_success_callback:
                     self.on_success_callback()  # Refresh entries
@@ -230,7 +213,7 @@ class MacOSLoginWindow:
             return
         
         if self.password_manager.unlock(password):
-            self.window.destroy()
+            self.hide()
             self.parent.deiconify()
             if self.on_success_callback:
                 self.on_success_callback()  # Refresh entries
@@ -239,6 +222,27 @@ class MacOSLoginWindow:
             self.password_entry.delete(0, tk.END)
             self.password_entry.focus_set()
     
+    def hide(self):
+        """Hide the window after a successful login (it is kept for reuse)"""
+        # Don't leave the master password in the hidden window
+        for entry in self._pwd_widgets:
+            entry.delete(0, tk.END)
+        self.window.withdraw()
+    
+    def show(self):
+        """Show the window again, e.g. after locking, with an empty login form"""
+        if self._form != "login":
+            self.setup_login()
+        else:
+            self.password_entry.delete(0, tk.END)
+            self.show_pwd_var.set(False)
+            self.toggle_password_visibility()
+        
+        self.parent.withdraw()
+        self.window.deiconify()
+        self.window.lift()
+        self.window.after(50, lambda: self.password_entry.focus_force())
+    
     def on_close(self):
         """Handle window close"""
         self.parent.quit()
@@ -251,32 +255,20 @@ class MacOSPasswordManagerGUI(BasePasswordManagerGUI):
         # Store references
         self.root = root
         self.password_manager = password_manager
+        # Generator options, kept for the whole session
+        self._gen_state = GeneratorState(root)
         
         # Setup styles
         self.setup_styles()
         
-        # Setup main UI first (but hidden)
-        self.setup_main_ui()
-        
-        # Use macOS-specific login window with callback
-        if platform.system() == "Darwin":
-            login_window = MacOSLoginWindow(root, password_manager, self.refresh_entries)
+        # Use macOS-specific login window with callback. It is kept and
+        # shown again when locking (see lock_manager in the base class)
+        if _IS_MACOS:
+            self._login = MacOSLoginWindow(root, password_manager, self._on_login)
         else:
             # Use original for other platforms
             from .gui import LoginWindow
-            login_window = LoginWindow(root, password_manager, self.refresh_entries)
+            self._login = LoginWindow(root, password_manager, self._on_login)
         
         # Bind events
         self.root.protocol("WM_DELETE_WINDOW", self.on_close)
-    
-    def lock_manager(self):
-        """Lock the password manager"""
-        self.password_manager.lock()
-        self.root.withdraw()
-        
-        # Use appropriate login window with callback
-        if platform.system() == "Darwin":
-            MacOSLoginWindow(self.root, self.password_manager, self.refresh_entries)
-        else:
-            from .gui import LoginWindow
-            LoginWindow(self.root, self.password_manager, self.refresh_entries) 
\ No newline at end of file
@@ -0,0 +1,77 @@
+"""
+conftest.py - Shared pytest fixtures for the SecureVault tests
+
+Setting a master password runs PBKDF2 on purpose slowly, so the unlocked
+managers here are only set up once per test session and then shared, and
+the iteration count is turned right down for the tests.
+"""
+
+import os
+
+import pytest
+
+from securevault.core import encryption
+from securevault.core.encryption import EncryptionManager
+from securevault.core.password_manager import PasswordManager
+
+
+def pytest_addoption(parser):
+    parser.addoption("--run-slow", action="store_true", default=False,
+                     help="also run tests marked slow (benchmarks)")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "slow: slow test, only run with --run-slow")
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip slow tests unless asked for, and benchmarks without pytest-benchmark"""
+    run_slow = config.getoption("--run-slow")
+    has_benchmark = config.pluginmanager.hasplugin("benchmark")
+    for item in items:
+        if "slow" in item.keywords and not run_slow:
+            item.add_marker(pytest.mark.skip(reason="slow test, use --run-slow to run it"))
+        elif "benchmark" in item.fixturenames and not has_benchmark:
+            item.add_marker(pytest.mark.skip(reason="needs pytest-benchmark"))
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _fast_kdf():
+    """Use 1,000 PBKDF2 iterations for master passwords set by the tests"""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(encryption, "KDF_ITERATIONS", 1000)
+        yield
+
+
+@pytest.fixture(scope="session")
+def unlocked_em(_fast_kdf, tmp_path_factory):
+    """EncryptionManager with the master password "TestPassword123!" set"""
+    em = EncryptionManager(storage_dir=str(tmp_path_factory.mktemp("vault")))
+    em.set_master_password("TestPassword123!")
+    return em
+
+
+@pytest.fixture
+def locked_em(unlocked_em):
+    """Fresh, still locked EncryptionManager using unlocked_em's master password file"""
+    return EncryptionManager(storage_dir=os.path.dirname(unlocked_em.master_password_file))
+
+
+@pytest.fixture(scope="session")
+def _session_pm(_fast_kdf, tmp_path_factory):
+    """PasswordManager with the master password "MasterPass123!" set"""
+    pm = PasswordManager(storage_dir=str(tmp_path_factory.mktemp("vault")))
+    pm.set_master_password("MasterPass123!")
+    return pm
+
+
+@pytest.fixture
+def pm(_session_pm):
+    """The shared unlocked PasswordManager, emptied again after each test"""
+    yield _session_pm
+
+    # Undo anything the test changed
+    if not _session_pm.is_unlocked:
+        _session_pm.unlock("MasterPass123!")
+    _session_pm.autosave = True
+    _session_pm.clear_entries()
@@ -6,207 +6,408 @@ I learned about unit testing late in the project, so these tests are quite basic
 In future projects, I would write tests as I develop (Test-Driven Development).
 """
 
+import base64
+import hashlib
+import hmac
+import json
 import os
-import sys
+import string
 
-# Add parent directory to path so we can import our modules
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pytest
+from cryptography.fernet import Fernet
 
-from securevault.core.encryption import EncryptionManager
+from securevault.core import encryption
+from securevault.core.encryption import EncryptionManager, LEGACY_KDF_ITERATIONS
 from securevault.core.password_manager import PasswordManager, PasswordEntry
 
 
-def test_encryption_manager():
-    """Test basic encryption functionality"""
-    print("Testing Encryption Manager...")
+def test_set_master_password(tmp_path):
+    """Setting the master password writes the master password file"""
+    em = EncryptionManager(storage_dir=str(tmp_path))
+    assert em.set_master_password("TestPassword123!") == True, "Failed to set master password"
+    assert EncryptionManager(storage_dir=str(tmp_path)).is_master_password_set()
+
+
+@pytest.mark.parametrize("password,expected", [
+    ("TestPassword123!", True),
+    ("WrongPassword", False),
+], ids=["verify-correct", "reject-wrong"])
+def test_verify_master_password(locked_em, password, expected):
+    """Only the right master password is accepted"""
+    assert locked_em.verify_master_password(password) == expected
+
+
+def test_key_cache(locked_em, monkeypatch):
+    """Only the key that verified is kept, so only re-checking it skips PBKDF2"""
+    real_pbkdf2 = hashlib.pbkdf2_hmac
+    calls = []
+    def counting_pbkdf2(*args, **kwargs):
+        calls.append(args)
+        return real_pbkdf2(*args, **kwargs)
+    monkeypatch.setattr(hashlib, "pbkdf2_hmac", counting_pbkdf2)
     
-    em = EncryptionManager()
+    assert locked_em.verify_master_password("TestPassword123!") == True
+    assert locked_em.verify_master_password("TestPassword123!") == True
+    assert len(calls) == 1
     
-    # Test 1: Setting master password
-    print("  Test 1: Setting master password...", end="")
-    result = em.set_master_password("TestPassword123!")
-    assert result == True, "Failed to set master password"
-    print(" PASSED")
+    # Wrong passwords are derived every time
+    assert locked_em.verify_master_password("WrongPassword") == False
+    assert locked_em.verify_master_password("WrongPassword") == False
+    assert len(calls) == 3
+    assert locked_em.verify_master_password("TestPassword123!") == True
+    assert len(calls) == 3
     
-    # Test 2: Verifying correct password
-    print("  Test 2: Verifying correct password...", end="")
-    result = em.verify_master_password("TestPassword123!")
-    assert result == True, "Failed to verify correct password"
-    print(" PASSED")
+    # Locking forgets the key
+    locked_em.clear_cache()
+    assert locked_em.verify_master_password("TestPassword123!") == True
+    assert len(calls) == 4
+
+
+def test_decrypt_cache(unlocked_em, monkeypatch):
+    """Decrypted passwords are cached until forgotten"""
+    token = unlocked_em.encrypt_password("cached password")
+    assert unlocked_em.decrypt_password(token) == "cached password"
     
-    # Test 3: Rejecting wrong password  
-    print("  Test 3: Rejecting wrong password...", end="")
-    result = em.verify_master_password("WrongPassword")
-    assert result == False, "Accepted wrong password!"
-    print(" PASSED")
+    # A second decrypt doesn't reach Fernet at all
+    def failing_decrypt(token):
+        raise AssertionError("decrypted again")
+    monkeypatch.setattr(unlocked_em.fernet, "decrypt", failing_decrypt)
+    assert unlocked_em.decrypt_password(token) == "cached password"
     
-    # Test 4: Encrypt and decrypt
-    print("  Test 4: Encrypt/decrypt cycle...", end="")
-    em.verify_master_password("TestPassword123!")  # Unlock first
-    test_password = "MySecretPassword@2024"
-    encrypted = em.encrypt_password(test_password)
-    decrypted = em.decrypt_password(encrypted)
-    assert decrypted == test_password, f"Decryption failed: {decrypted} != {test_password}"
-    print(" PASSED")
+    unlocked_em.forget_password(token)
+    assert unlocked_em.decrypt_password(token) == "[Decryption Error]"
+
+
+def test_master_file_cache(tmp_path):
+    """The master password file is only read once"""
+    EncryptionManager(storage_dir=str(tmp_path)).set_master_password("TestPassword123!")
+    em = EncryptionManager(storage_dir=str(tmp_path))
+    assert em.verify_master_password("TestPassword123!") == True
+    
+    os.remove(tmp_path / "master_password.json")
+    assert em.is_master_password_set()
+    assert em.verify_master_password("WrongPassword") == False
+    assert em.verify_master_password("TestPassword123!") == True
+
+
+@pytest.mark.parametrize("plain", [
+    "MySecretPassword@2024",
+    "sécond",
+    "",
+], ids=["ascii", "non-ascii", "empty"])
+def test_encrypt_decrypt_roundtrip(unlocked_em, plain):
+    """Encrypting and decrypting gives back the same password"""
+    encrypted = unlocked_em.encrypt_password(plain)
+    decrypted = unlocked_em.decrypt_password(encrypted)
+    assert decrypted == plain, f"Decryption failed: {decrypted} != {plain}"
+
+
+@pytest.mark.slow
+def test_encrypt_bench(benchmark, unlocked_em):
+    """Time one encrypt/decrypt round trip (run with --run-slow)"""
+    result = benchmark(lambda: unlocked_em.decrypt_password(unlocked_em.encrypt_password("x" * 32)))
+    assert result == "x" * 32
+
+
+def test_bulk_decrypt(unlocked_em):
+    """Bulk decrypt matches single decrypt"""
+    em = unlocked_em
+    plain = ["first", "sécond", "x" * 40]
+    tokens = [em.encrypt_password(p) for p in plain]
+    assert em.decrypt_passwords(tokens) == plain
+    assert em.decrypt_passwords(["not-a-token"]) == ["[Decryption Error]"]
+
+
+def test_version1_master_file(tmp_path):
+    """Files from before versioning (PBKDF2-SHA256) still unlock"""
+    em = EncryptionManager(storage_dir=str(tmp_path))
+    salt = em.generate_salt()
+    old_key = em.derive_key_from_password("OldPassword123!", salt, "sha256",
+                                          LEGACY_KDF_ITERATIONS)
+    with open(tmp_path / "master_password.json", "w") as f:
+        json.dump({
+            "salt": base64.b64encode(salt).decode('utf-8'),
+            "verification": Fernet(old_key).encrypt(b"PASSWORD_CORRECT").decode('utf-8')
+        }, f)
+    old_em = EncryptionManager(storage_dir=str(tmp_path))
+    assert old_em.verify_master_password("OldPassword123!") == True
+    assert old_em.verify_master_password("WrongPassword") == False
+
+
+# Character classes, for checking which ones a password uses
+_UPPER = frozenset(string.ascii_uppercase)
+_LOWER = frozenset(string.ascii_lowercase)
+_DIGITS = frozenset(string.digits)
+_LETTERS = _UPPER | _LOWER
+
+
+def test_kdf_cost(tmp_path, monkeypatch):
+    """The iteration count is stored with the master password and used to verify it"""
+    # An explicit cost wins over KDF_ITERATIONS
+    em = EncryptionManager(storage_dir=str(tmp_path))
+    assert em.set_master_password("TestPassword123!", cost=2000)
+    with open(tmp_path / "master_password.json") as f:
+        assert json.load(f)["iterations"] == 2000
     
-    # Clean up test files
-    if os.path.exists("master_password.json"):
-        os.remove("master_password.json")
+    # Without one KDF_ITERATIONS is used (lowered to 1,000 by conftest.py)
+    assert em.set_master_password("TestPassword123!")
+    with open(tmp_path / "master_password.json") as f:
+        assert json.load(f)["iterations"] == encryption.KDF_ITERATIONS == 1000
     
-    print("✓ All encryption tests passed!\n")
+    # Verifying uses the stored count, not the current default
+    monkeypatch.setattr(encryption, "KDF_ITERATIONS", 100000)
+    new_em = EncryptionManager(storage_dir=str(tmp_path))
+    assert new_em.verify_master_password("TestPassword123!") == True
+    assert new_em.verify_master_password("WrongPassword") == False
 
 
-def test_password_generator():
-    """Test password generation"""
-    print("Testing Password Generator...")
+def test_verify_is_constant_time(locked_em, monkeypatch):
+    """A wrong password is checked with one compare_digest against the stored fingerprint"""
+    with open(locked_em.master_password_file) as f:
+        stored = json.load(f)["fingerprint"]
     
-    pm = PasswordManager()
+    # Record every comparison verify_master_password makes
+    real_compare = hmac.compare_digest
+    calls = []
+    def recording_compare(a, b):
+        calls.append((a, b))
+        return real_compare(a, b)
+    monkeypatch.setattr(hmac, "compare_digest", recording_compare)
     
-    # Test 1: Default generation
-    print("  Test 1: Default password generation...", end="")
+    assert locked_em.verify_master_password("WrongPassword") == False
+    assert len(calls) == 1, "verify_master_password didn't use compare_digest"
+    assert calls[0][1] == stored
+
+
+def test_generate_default():
+    """Default options give 16 characters using every character class"""
+    pm = PasswordManager()
     pwd = pm.generate_password()
     assert len(pwd) == 16, f"Wrong default length: {len(pwd)}"
-    assert any(c.isupper() for c in pwd), "No uppercase letters"
-    assert any(c.islower() for c in pwd), "No lowercase letters"
-    assert any(c.isdigit() for c in pwd), "No digits"
-    print(" PASSED")
-    
-    # Test 2: Custom length
-    print("  Test 2: Custom length (20 chars)...", end="")
-    pwd = pm.generate_password(length=20)
-    assert len(pwd) == 20, f"Wrong custom length: {len(pwd)}"
-    print(" PASSED")
-    
-    # Test 3: Only letters
-    print("  Test 3: Letters only...", end="")
-    pwd = pm.generate_password(use_digits=False, use_symbols=False)
-    assert not any(c.isdigit() for c in pwd), "Contains digits"
-    assert all(c.isalpha() for c in pwd), "Contains non-letters"
-    print(" PASSED")
-    
-    print("✓ All password generator tests passed!\n")
-
-
-def test_password_entry():
-    """Test password entry creation"""
-    print("Testing Password Entry...")
-    
-    # Test 1: Create entry
-    print("  Test 1: Creating entry...", end="")
-    entry = PasswordEntry("google.com", "test@email.com", "password123", "My notes")
-    assert entry.website == "google.com"
-    assert entry.username == "test@email.com"
-    assert entry.password == "password123"
-    assert entry.notes == "My notes"
-    print(" PASSED")
-    
-    # Test 2: Convert to dict
-    print("  Test 2: Converting to dictionary...", end="")
+    
+    # One password can miss a class by chance, so check a batch of them.
+    # The distinct characters are collected once and compared as sets
+    used = set("".join(pm.generate_password() for _ in range(20)))
+    assert used & _UPPER, "No uppercase letters"
+    assert used & _LOWER, "No lowercase letters"
+    assert used & _DIGITS, "No digits"
+    assert used - _LETTERS - _DIGITS, "No symbols"
+
+
+@pytest.mark.parametrize("length", [8, 16, 20, 32])
+@pytest.mark.parametrize("use_digits,use_symbols", [(True, True), (False, False)],
+                         ids=["all-classes", "letters-only"])
+def test_generate_length(length, use_digits, use_symbols):
+    """Passwords have the requested length whatever the options"""
+    pwd = PasswordManager().generate_password(length=length, use_digits=use_digits,
+                                              use_symbols=use_symbols)
+    assert len(pwd) == length, f"Wrong custom length: {len(pwd)}"
+
+
+@pytest.mark.parametrize("length", [8, 16, 20, 32])
+def test_generate_letters_only(length):
+    """Without digits and symbols only letters are used"""
+    pwd = PasswordManager().generate_password(length=length, use_digits=False,
+                                              use_symbols=False)
+    used = set(pwd)
+    assert not used & _DIGITS, "Contains digits"
+    assert used <= _LETTERS, "Contains non-letters"
+
+
+def test_generate_batch():
+    """generate_passwords gives count passwords of the same length"""
+    pwds = PasswordManager().generate_passwords(5, length=12)
+    assert len(pwds) == 5
+    assert all(len(p) == 12 for p in pwds)
+
+
+# Sample entry and its dict, built once when the module is imported.
+# Tests must not modify them
+_SAMPLE_ENTRY = PasswordEntry("google.com", "test@email.com", "password123", "My notes")
+_SAMPLE_DICT = _SAMPLE_ENTRY.to_dict()
+
+
+@pytest.mark.parametrize("website,username,password,notes", [
+    ("google.com", "test@email.com", "password123", "My notes"),
+    ("github.com", "dev@test.com", "gh-Pass!2024", ""),
+    ("bank.example", "José", "pässwörd", "line one\nline two"),
+], ids=["google", "no-notes", "non-ascii"])
+def test_password_entry(website, username, password, notes):
+    """Entries keep their fields through to_dict/from_dict"""
+    entry = PasswordEntry(website, username, password, notes)
+    assert entry.website == website
+    assert entry.username == username
+    assert entry.password == password
+    assert entry.notes == notes
+    
     entry_dict = entry.to_dict()
-    assert "website" in entry_dict
-    assert "username" in entry_dict
-    assert "password" in entry_dict
-    assert "created_date" in entry_dict
-    print(" PASSED")
-    
-    # Test 3: Create from dict
-    print("  Test 3: Creating from dictionary...", end="")
     new_entry = PasswordEntry.from_dict(entry_dict)
     assert new_entry.website == entry.website
     assert new_entry.username == entry.username
-    print(" PASSED")
+    assert new_entry.password == entry.password
+    assert new_entry.notes == entry.notes
     
-    print("✓ All password entry tests passed!\n")
+    # The dict is built once and then reused
+    assert entry.to_dict() is entry_dict
 
 
-def test_password_manager_integration():
-    """Test the full password manager workflow"""
-    print("Testing Password Manager Integration...")
-    
-    pm = PasswordManager()
-    
-    # Test 1: Set master password
-    print("  Test 1: Setting up master password...", end="")
-    result = pm.set_master_password("MasterPass123!")
-    assert result == True
-    assert pm.is_unlocked == True
-    print(" PASSED")
+def test_entry_to_dict():
+    """to_dict has every stored field"""
+    for key in ("website", "username", "password", "notes", "created_date", "modified_date"):
+        assert key in _SAMPLE_DICT
+    assert _SAMPLE_ENTRY.to_dict() is _SAMPLE_DICT
+
+
+def test_entry_missing_dates():
+    """Entries stored without dates get one instead of saving null"""
+    entry = PasswordEntry.from_dict({"website": "old.com", "username": "me",
+                                     "password": "x", "created_date": "2020-01-01T00:00:00"})
+    assert entry.created_date == "2020-01-01T00:00:00"
+    assert entry.modified_date is not None
     
-    # Test 2: Add entry
-    print("  Test 2: Adding password entry...", end="")
+    entry = PasswordEntry.from_dict({"website": "old.com", "username": "me", "password": "x"})
+    assert entry.to_dict()["created_date"] is not None
+    assert entry.to_dict()["modified_date"] is not None
+
+
+def test_entry_from_dict():
+    """from_dict gives back the entry to_dict came from"""
+    new_entry = PasswordEntry.from_dict(_SAMPLE_DICT)
+    assert new_entry.website == _SAMPLE_ENTRY.website
+    assert new_entry.username == _SAMPLE_ENTRY.username
+    assert new_entry.password == _SAMPLE_ENTRY.password
+    assert new_entry.notes == _SAMPLE_ENTRY.notes
+
+
+def _add_facebook(pm):
+    """Add the sample entry the integration tests work on"""
     pm.add_entry("facebook.com", "user@test.com", "fbpassword123", "Test account")
+
+
+def test_add_entry(pm):
+    """Added entries show up in get_entries"""
+    assert pm.is_unlocked == True
+    _add_facebook(pm)
     entries = pm.get_entries()
     assert len(entries) == 1
-    print(" PASSED")
-    
-    # Test 3: Search functionality
-    print("  Test 3: Searching entries...", end="")
+
+
+def test_search_entry(pm):
+    """Searching finds entries by part of their text"""
+    _add_facebook(pm)
     results = pm.get_entries("facebook")
     assert len(results) == 1
     assert results[0][1].website == "facebook.com"
-    print(" PASSED")
-    
-    # Test 4: Update entry
-    print("  Test 4: Updating entry...", end="")
-    pm.update_entry(0, password="newpassword456")
+    # Narrowing an earlier result (what the GUI does while typing)
+    assert results[0][1].matches("facebook.c")
+    assert not results[0][1].matches("twitter")
+
+
+def test_search_snapshot(pm):
+    """Searching a snapshot isn't affected by later changes"""
+    _add_facebook(pm)
+    snapshot = pm.search_snapshot()
+    pm.add_entry("facebook.org", "user@test.com", "fbpassword456")
+    pm.delete_entry(0)
+    results = pm.get_entries("facebook", snapshot)
+    assert [(i, view.website) for i, view in results] == [(0, "facebook.com")]
+
+
+def test_update_entry(pm):
+    """Updating a password stores the new one"""
+    _add_facebook(pm)
+    old_dict = pm.entries[0].to_dict()
+    pm.update_entry(0, password="newpassword456", notes="changed")
     entries = pm.get_entries()
     assert entries[0][1].password == "newpassword456"
-    print(" PASSED")
     
-    # Test 5: Delete entry
-    print("  Test 5: Deleting entry...", end="")
+    # The cached dict that gets saved was rebuilt
+    new_dict = pm.entries[0].to_dict()
+    assert new_dict is not old_dict
+    assert new_dict["notes"] == "changed"
+    assert new_dict["password"] == pm.entries[0].password
+
+
+def test_delete_entry(pm):
+    """Deleted entries are gone"""
+    _add_facebook(pm)
     pm.delete_entry(0)
     entries = pm.get_entries()
     assert len(entries) == 0
-    print(" PASSED")
-    
-    # Test 6: Lock and unlock
-    print("  Test 6: Lock and unlock...", end="")
+
+
+def test_lock_unlock(pm):
+    """Entries come back after locking and unlocking again"""
+    _add_facebook(pm)
     pm.lock()
     assert pm.is_unlocked == False
     result = pm.unlock("MasterPass123!")
     assert result == True
     assert pm.is_unlocked == True
-    print(" PASSED")
-    
-    # Clean up test files
-    for file in ["master_password.json", "passwords.json"]:
-        if os.path.exists(file):
-            os.remove(file)
-    
-    print("✓ All integration tests passed!\n")
-
-
-def run_all_tests():
-    """Run all test suites"""
-    print("=" * 50)
-    print("Running SecureVault Test Suite")
-    print("=" * 50)
-    print()
-    
-    try:
-        test_encryption_manager()
-        test_password_generator()
-        test_password_entry()
-        test_password_manager_integration()
-        
-        print("=" * 50)
-        print("✓ ALL TESTS PASSED!")
-        print("=" * 50)
-        
-    except AssertionError as e:
-        print(f"\n✗ TEST FAILED: {e}")
-        return False
-    except Exception as e:
-        print(f"\n✗ UNEXPECTED ERROR: {e}")
-        return False
-    
-    return True
-
-
-if __name__ == "__main__":
-    # Run tests
-    success = run_all_tests()
-    
-    # Exit with appropriate code
-    sys.exit(0 if success else 1) 
\ No newline at end of file
+    assert pm.get_entries()[0][1].password == "fbpassword123"
+
+
+def test_lock_after_failed_save(pm, monkeypatch):
+    """Locking still locks when the pending changes can't be saved"""
+    def failing_replace(src, dst):
+        raise OSError("disk full")
+    monkeypatch.setattr(os, "replace", failing_replace)
+    with pytest.raises(Exception):
+        _add_facebook(pm)
+    
+    with pytest.raises(Exception, match="Failed to save"):
+        pm.lock()
+    assert pm.is_unlocked == False
+    assert pm.encryption_manager.fernet is None
+
+
+def test_duplicate_entry(pm):
+    """The same website (any case) and username can't be added twice"""
+    pm.add_entry("github.com", "dev@test.com", "ghpassword1")
+    with pytest.raises(ValueError):
+        pm.add_entry("GitHub.com", "dev@test.com", "other")
+    pm.delete_entry(0)
+    pm.add_entry("github.com", "dev@test.com", "ghpassword2")
+    assert len(pm.get_entries()) == 1
+
+
+@pytest.mark.parametrize("count", [1, 10_000], ids=["one-site", "10k-entries"])
+def test_find_by_website(pm, count):
+    """The website index gives the exact matches of a substring search"""
+    pm.autosave = False
+    for i in range(count):
+        pm.add_entry(f"site{i}.com", "me@test.com", f"pass{i}")
+    pm.add_entry("SITE0.com", "other@test.com", "pass")
+    
+    for website in ("site0.com", f"site{count - 1}.com"):
+        found = [(i, view.username) for i, view in pm.find_by_website(website)]
+        searched = [(i, view.username) for i, view in pm.get_entries(website)
+                    if view.website.lower() == website]
+        assert found == searched
+    assert len(pm.find_by_website("Site0.COM")) == 2
+    assert pm.find_by_website("site") == []
+    
+    # The index follows updates and deletes
+    pm.update_entry(0, website="renamed.com")
+    assert [i for i, _ in pm.find_by_website("renamed.com")] == [0]
+    pm.delete_entry(0)
+    assert pm.find_by_website("renamed.com") == []
+    assert [view.username for _, view in pm.find_by_website("site0.com")] == ["other@test.com"]
+
+
+def test_batched_saves(pm):
+    """Test saving with autosave turned off"""
+    # Test 1: Changes stay in memory until flush
+    pm.autosave = False
+    pm.add_entry("example.com", "me@test.com", "examplepass1")
+    pm.add_entry("example.org", "me@test.com", "examplepass2")
+    other = PasswordManager(os.path.dirname(pm.passwords_file))
+    other.unlock("MasterPass123!")
+    assert len(other.get_entries()) == 0
+    
+    # Test 2: Flush writes everything at once
+    pm.flush()
+    other.load_entries()
+    assert len(other.get_entries()) == 2
+    assert not os.path.exists(pm.passwords_file + ".tmp")
+    